@@ -3,10 +3,19 @@
 Estratégias avançadas para evitar bloqueios e otimizar performance no GodOfPrompt scraper
 """
 
+import asyncio
+import itertools
 import random
 import time
 import json
-import hashlib
+import re
+import secrets
+import socket
+import statistics
+import sys
+import threading
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Callable
 from urllib.parse import urljoin
@@ -18,8 +27,125 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import requests
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
-@dataclass
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Argumentos do Chrome que não variam entre drivers
+_STATIC_CHROME_ARGS = (
+    "--headless",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    "--disable-plugins",
+    "--disable-images",  # Economiza banda
+    "--disable-javascript-harmony-shipping",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+)
+
+# Preferências avançadas do perfil
+_CHROME_PREFS = {
+    "profile.default_content_setting_values": {
+        "notifications": 2,
+        "media_stream": 2,
+    },
+    "profile.managed_default_content_settings": {
+        "images": 2  # Bloquear imagens para performance
+    }
+}
+
+# Recursos bloqueados na camada de rede (CDP) - não são necessários para extração
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.css",
+    "*.mp4", "*.webm",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+]
+
+# Patches anti-detecção aplicados antes de cada documento (um único comando CDP)
+# (IIFE: nenhuma variável global vaza para o documento)
+STEALTH_JS = """
+(() => {
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'languages', {get: () => ['pt-BR', 'pt', 'en-US', 'en']});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    window.chrome = window.chrome || {runtime: {}};
+    const permissions = window.navigator.permissions;
+    const originalQuery = permissions && permissions.query;
+    if (originalQuery) {
+        permissions.query = (parameters) => (
+            parameters.name === 'notifications'
+                ? Promise.resolve({state: Notification.permission})
+                : originalQuery.call(permissions, parameters)
+        );
+    }
+})();
+"""
+
+# Sessão HTTP compartilhada (keep-alive) para chamadas fora do Selenium
+http_session = requests.Session()
+http_session.headers.update({'Connection': 'keep-alive'})
+
+
+# Cache de resolução DNS compartilhado pelo processo
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, tuple] = {}
+_dns_cache_lock = threading.Lock()
+
+
+def install_dns_cache(ttl: float = 300.0, max_entries: int = 128):
+    """Instala cache com TTL em socket.getaddrinfo (idempotente)
+    
+    O Chrome já mantém seu próprio cache de DNS; o ganho aqui é para as
+    chamadas requests/aiohttp feitas fora do navegador.
+    """
+    if getattr(socket.getaddrinfo, '_dns_cached', False):
+        return
+    
+    def cached_getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        
+        with _dns_cache_lock:
+            entry = _dns_cache.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+        
+        result = _original_getaddrinfo(*args, **kwargs)
+        
+        with _dns_cache_lock:
+            if len(_dns_cache) >= max_entries:
+                _dns_cache.clear()
+            _dns_cache[key] = (now, result)
+        
+        return result
+    
+    cached_getaddrinfo._dns_cached = True
+    socket.getaddrinfo = cached_getaddrinfo
+    logger.info("Cache de DNS instalado (TTL %.0fs)", ttl)
+
+
+# dataclass(slots=True) só existe a partir do Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ScrapingConfig:
     """Configurações avançadas para scraping defensivo"""
     
@@ -31,6 +157,8 @@ class ScrapingConfig:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0"
     ])
+    # Pesos opcionais por User-Agent (mesma ordem de user_agents); None = uniforme
+    user_agent_weights: Optional[tuple] = None
     
     # Delays adaptativos
     min_delay: float = 2.0
@@ -43,6 +171,8 @@ class ScrapingConfig:
     request_timeout: int = 30
     max_pages_per_category: int = 50
     concurrent_categories: int = 1  # Conservador por padrão
+    concurrent_requests: int = 8  # Requisições HTTP simultâneas (sem navegador)
+    dns_cache_ttl: float = 300.0  # Segundos; 0 desativa o cache de DNS
     
     # Monitoramento
     success_threshold: float = 0.8  # 80% de sucesso mínimo
@@ -50,11 +180,84 @@ class ScrapingConfig:
         "blocked", "captcha", "rate limit", "too many requests", 
         "access denied", "forbidden", "bot detection"
     ])
+    
+    # Autômato Aho-Corasick das palavras de bloqueio (construído uma única vez)
+    _block_automaton: Optional[object] = field(default=None, init=False, repr=False, compare=False)
+    # Alternativa sem dependências: alternância compilada, sem diferenciar maiúsculas
+    _block_re: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    # Pesos acumulados pré-calculados para random.choices
+    _user_agent_cum_weights: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Tupla imutável: sorteio por índice sem o overhead de lista
+        self.user_agents = tuple(self.user_agents)
+        if self.user_agent_weights is not None:
+            if len(self.user_agent_weights) != len(self.user_agents):
+                raise ValueError("user_agent_weights deve ter um peso por User-Agent")
+            self._user_agent_cum_weights = tuple(itertools.accumulate(self.user_agent_weights))
+        
+        if self.block_detection_keywords:
+            self._block_re = re.compile(
+                '|'.join(map(re.escape, self.block_detection_keywords)), re.IGNORECASE
+            )
+        
+        if AHOCORASICK_AVAILABLE and self.block_detection_keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.block_detection_keywords:
+                keyword = keyword.lower()
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._block_automaton = automaton
+    
+    def pick_user_agent(self) -> str:
+        """Sorteia um User-Agent, respeitando os pesos quando configurados"""
+        if self._user_agent_cum_weights is None:
+            return random.choice(self.user_agents)
+        return random.choices(self.user_agents, cum_weights=self._user_agent_cum_weights, k=1)[0]
+    
+    def find_block_keyword(self, page_content: str) -> Optional[str]:
+        """Retorna a primeira palavra de bloqueio encontrada (em minúsculas)"""
+        if self._block_automaton is not None:
+            # Uma única varredura sobre o texto, encerrando no primeiro match
+            for _, keyword in self._block_automaton.iter(page_content.lower()):
+                return keyword
+            return None
+        
+        if self._block_re is None:
+            return None
+        
+        # IGNORECASE dispensa a cópia do conteúdo em minúsculas
+        match = self._block_re.search(page_content)
+        return match.group(0).lower() if match else None
+
+
+# Status HTTP que indicam bloqueio/rate limit na resposta do documento
+_BLOCK_STATUS_CODES = frozenset({401, 403, 429, 503})
+
+# Status HTTP do documento principal (Navigation Timing; Chrome 109+), sem ler o DOM
+_NAVIGATION_STATUS_JS = (
+    "var nav = performance.getEntriesByType('navigation')[0];"
+    "return nav ? nav.responseStatus : null;"
+)
+
+
+# Trecho mínimo da página para detectar bloqueio (evita serializar o DOM inteiro)
+_BLOCK_SNIPPET_JS = (
+    "return (document.title + ' ' + (document.body ? document.body.innerText : ''))"
+    ".slice(0, 8192).toLowerCase();"
+)
+
+
+# Entradas da tabela de backoff; além disso o multiplicador já está saturado
+_BACKOFF_TABLE_SIZE = 16
 
 
 class AdaptiveDelayManager:
     """Gerenciador de delays adaptativos baseado em sucesso/falha"""
     
+    __slots__ = ('config', 'success_count', 'error_count', 'consecutive_errors',
+                 'current_delay', '_backoff', 'get_delay')
+    
     def __init__(self, config: ScrapingConfig):
         self.config = config
         self.success_count = 0
@@ -62,12 +265,51 @@ class AdaptiveDelayManager:
         self.consecutive_errors = 0
         self.current_delay = config.min_delay
         
-    def get_delay(self) -> float:
-        """Calcula delay adaptativo baseado no histórico"""
+        # Tabela de backoff pré-calculada (multiplicador limitado a 8x)
+        self._backoff = [config.error_backoff_base * min(2 ** i, 8)
+                         for i in range(_BACKOFF_TABLE_SIZE)]
+        
+        # Versão especializada para esta configuração (ver compile_get_delay)
+        self.get_delay = self.compile_get_delay()
+    
+    def compile_get_delay(self) -> Callable[[], float]:
+        """Gera um get_delay com os limites da configuração fixados no closure
+        
+        A configuração não muda durante a execução, então min/max delay e a
+        tabela de backoff viram variáveis livres do closure em vez de
+        atributos lidos a cada chamada. Mesmo resultado de generic_get_delay.
+        """
+        min_delay = self.config.min_delay
+        max_delay = self.config.max_delay
+        backoff = tuple(self._backoff)
+        last_index = _BACKOFF_TABLE_SIZE - 1
+        rand = random.random
+        
+        def get_delay() -> float:
+            errors = self.consecutive_errors
+            if errors > 0:
+                adaptive_delay = backoff[errors if errors < last_index else last_index]
+            else:
+                successes = self.success_count
+                success_ratio = successes / max(successes + self.error_count, 1)
+                adaptive_delay = min_delay if success_ratio > 0.9 else self.current_delay
+            
+            final_delay = adaptive_delay * (0.5 + rand())
+            if final_delay < min_delay:
+                final_delay = min_delay
+            if final_delay > max_delay:
+                final_delay = max_delay
+            
+            self.current_delay = final_delay
+            return final_delay
+        
+        return get_delay
+    
+    def generic_get_delay(self) -> float:
+        """Calcula delay adaptativo baseado no histórico (implementação genérica)"""
         # Aumenta delay após erros consecutivos
         if self.consecutive_errors > 0:
-            multiplier = min(2 ** self.consecutive_errors, 8)
-            adaptive_delay = self.config.error_backoff_base * multiplier
+            adaptive_delay = self._backoff[min(self.consecutive_errors, _BACKOFF_TABLE_SIZE - 1)]
         else:
             # Diminui gradualmente o delay após sucessos
             success_ratio = self.success_count / max(self.success_count + self.error_count, 1)
@@ -77,7 +319,7 @@ class AdaptiveDelayManager:
                 adaptive_delay = self.current_delay
         
         # Adiciona jitter aleatório para mascarar padrões
-        jitter = random.uniform(0.5, 1.5)
+        jitter = 0.5 + random.random()
         final_delay = max(adaptive_delay * jitter, self.config.min_delay)
         final_delay = min(final_delay, self.config.max_delay)
         
@@ -98,25 +340,30 @@ class AdaptiveDelayManager:
 class AntiDetectionDriver:
     """Driver com recursos avançados de anti-detecção"""
     
-    def __init__(self, config: ScrapingConfig):
+    __slots__ = ('config', 'delay_manager', 'session_fingerprint', 'rotate_every',
+                 '_driver', '_pages_on_driver')
+    
+    def __init__(self, config: ScrapingConfig, rotate_every: int = 25):
         self.config = config
         self.delay_manager = AdaptiveDelayManager(config)
         self.session_fingerprint = self._generate_session_id()
         
+        # Driver reutilizável entre páginas (rotacionado a cada N páginas)
+        self.rotate_every = rotate_every
+        self._driver = None
+        self._pages_on_driver = 0
+        
     def _generate_session_id(self) -> str:
         """Gera ID único para a sessão"""
-        timestamp = str(time.time())
-        return hashlib.md5(timestamp.encode()).hexdigest()[:8]
+        return secrets.token_hex(4)
         
     def create_driver(self) -> webdriver.Chrome:
         """Cria driver com configurações anti-detecção avançadas"""
         chrome_options = Options()
         
-        # Configurações básicas
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
+        # Argumentos fixos (básicos + anti-detecção)
+        for argument in _STATIC_CHROME_ARGS:
+            chrome_options.add_argument(argument)
         
         # Janela com dimensões variáveis (mais natural)
         width = random.randint(1366, 1920)
@@ -124,50 +371,80 @@ class AntiDetectionDriver:
         chrome_options.add_argument(f"--window-size={width},{height}")
         
         # User-Agent rotativo
-        user_agent = random.choice(self.config.user_agents)
+        user_agent = self.config.pick_user_agent()
         chrome_options.add_argument(f"--user-agent={user_agent}")
         
-        # Anti-detecção avançada
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Economiza banda
-        chrome_options.add_argument("--disable-javascript-harmony-shipping")
-        chrome_options.add_argument("--disable-background-timer-throttling")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        
         # Configurações experimentais
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_experimental_option("prefs", _CHROME_PREFS)
         
-        # Preferências avançadas
-        prefs = {
-            "profile.default_content_setting_values": {
-                "notifications": 2,
-                "media_stream": 2,
-            },
-            "profile.managed_default_content_settings": {
-                "images": 2  # Bloquear imagens para performance
-            }
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
+        # Retornar do driver.get no DOMContentLoaded, sem esperar subrecursos
+        chrome_options.page_load_strategy = 'eager'
         
-        driver = webdriver.Chrome(options=chrome_options)
+        # keep_alive reutiliza a conexão HTTP com o chromedriver entre comandos
+        driver = webdriver.Chrome(options=chrome_options, keep_alive=True)
         
         # Configurações pós-criação
         driver.set_page_load_timeout(self.config.request_timeout)
-        driver.implicitly_wait(10)
         
-        # Executar script para mascarar automação
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Bloquear imagens, fontes, CSS e analytics antes de qualquer navegação
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
         
-        logging.info(f"Driver criado - Sessão: {self.session_fingerprint} | UA: {user_agent[:50]}...")
+        # Mascarar automação antes dos scripts da página (vale para todas as navegações)
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": STEALTH_JS})
+        
+        logger.info("Driver criado - Sessão: %s | UA: %.50s...", self.session_fingerprint, user_agent)
         
         return driver
     
+    def acquire_driver(self) -> webdriver.Chrome:
+        """Retorna o driver reutilizável, criando ou rotacionando quando necessário"""
+        if self._driver is not None and self._pages_on_driver >= self.rotate_every:
+            logger.info("Rotacionando driver após %d páginas", self._pages_on_driver)
+            self.release_driver()
+        
+        if self._driver is None:
+            self._driver = self.create_driver()
+            self._pages_on_driver = 0
+        
+        return self._driver
+    
+    def release_driver(self):
+        """Encerra o driver reutilizável, se existir"""
+        if self._driver is None:
+            return
+        
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.warning("Erro encerrando driver: %s", e)
+        finally:
+            self._driver = None
+            self._pages_on_driver = 0
+    
+    @contextmanager
+    def driver_pool(self, max_pages_before_rotate: int = 25):
+        """Context manager que mantém um driver vivo entre várias páginas
+        
+        Retorna uma função que entrega o driver atual; após
+        `max_pages_before_rotate` páginas o driver é substituído por um novo.
+        """
+        previous_rotate_every = self.rotate_every
+        self.rotate_every = max_pages_before_rotate
+        try:
+            yield self.acquire_driver
+        finally:
+            self.release_driver()
+            self.rotate_every = previous_rotate_every
+    
     def smart_wait(self, driver: webdriver.Chrome, condition: Callable, timeout: int = None) -> bool:
-        """Espera inteligente com retry e delay adaptativo"""
+        """Espera inteligente com retry e delay adaptativo
+        
+        O driver não usa implicit wait; esperas devem ser explícitas
+        (WebDriverWait/expected_conditions), por este método ou diretamente.
+        """
         if timeout is None:
             timeout = self.config.request_timeout
             
@@ -176,7 +453,7 @@ class AntiDetectionDriver:
             
             # Delay após carregamento bem-sucedido
             delay = self.delay_manager.get_delay()
-            logging.debug(f"Aguardando {delay:.2f}s após carregamento...")
+            logger.debug("Aguardando %.2fs após carregamento...", delay)
             time.sleep(delay)
             
             self.delay_manager.record_success()
@@ -184,32 +461,149 @@ class AntiDetectionDriver:
             
         except Exception as e:
             self.delay_manager.record_error()
-            logging.warning(f"Timeout na espera: {e}")
+            logger.warning("Timeout na espera: %s", e)
             
             # Delay maior após erro
             error_delay = self.delay_manager.get_delay() * 2
             time.sleep(error_delay)
             return False
     
+    def _check_static_html(self, url: str, html: str, required_marker: Optional[str]) -> Optional[str]:
+        """Valida HTML obtido via HTTP; None se bloqueado ou dependente de JavaScript"""
+        keyword = self.config.find_block_keyword(html)
+        if keyword is not None:
+            logger.warning("Possível bloqueio detectado via HTTP: '%s' em %s", keyword, url)
+            self.delay_manager.record_error()
+            return None
+        
+        # Sem o marcador a página é renderizada via JS - precisa do Selenium
+        if required_marker and required_marker not in html:
+            logger.debug("Marcador ausente no HTML estático: %s", url)
+            return None
+        
+        self.delay_manager.record_success()
+        return html
+    
+    def fetch_static_page(self, url: str, required_marker: Optional[str] = None) -> Optional[str]:
+        """Busca HTML via HTTP (keep-alive), sem abrir navegador"""
+        try:
+            response = http_session.get(
+                url,
+                headers={'User-Agent': self.config.pick_user_agent()},
+                timeout=self.config.request_timeout
+            )
+        except requests.RequestException as e:
+            logger.warning("Erro HTTP carregando %s: %s", url, e)
+            self.delay_manager.record_error()
+            return None
+        
+        if response.status_code != 200:
+            logger.warning("Status code %s para %s", response.status_code, url)
+            self.delay_manager.record_error()
+            return None
+        
+        return self._check_static_html(url, response.text, required_marker)
+    
+    async def fetch_all(self, urls: List[str], required_marker: Optional[str] = None,
+                        concurrency: int = None) -> Dict[str, Optional[str]]:
+        """Busca várias páginas concorrentemente via aiohttp
+        
+        Retorna {url: html}; o valor é None quando a página precisa de
+        JavaScript (marcador ausente), foi bloqueada ou falhou.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp não está disponível. Instale com: pip install aiohttp")
+        
+        semaphore = asyncio.Semaphore(concurrency or self.config.concurrent_requests)
+        connector = aiohttp.TCPConnector(
+            limit=concurrency or self.config.concurrent_requests,
+            # ttl_dns_cache=None no aiohttp é cache eterno: 0 desliga o cache de fato
+            use_dns_cache=self.config.dns_cache_ttl > 0,
+            ttl_dns_cache=self.config.dns_cache_ttl if self.config.dns_cache_ttl > 0 else None
+        )
+        timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
+        headers = {'User-Agent': self.config.pick_user_agent()}
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=headers) as session:
+            async def fetch(url: str):
+                async with semaphore:
+                    try:
+                        async with session.get(url) as response:
+                            if response.status != 200:
+                                logger.warning("Status code %s para %s", response.status, url)
+                                self.delay_manager.record_error()
+                                return url, None
+                            html = await response.text()
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        logger.warning("Erro HTTP carregando %s: %s", url, e)
+                        self.delay_manager.record_error()
+                        return url, None
+                    
+                    # Throttle adaptativo sem bloquear o event loop
+                    await asyncio.sleep(self.delay_manager.get_delay())
+                    return url, self._check_static_html(url, html, required_marker)
+            
+            results = await asyncio.gather(*(fetch(url) for url in urls))
+        
+        return dict(results)
+    
+    def get_page_html(self, url: str, required_marker: Optional[str] = None,
+                      driver: webdriver.Chrome = None) -> Optional[str]:
+        """Obtém HTML via HTTP quando possível, com fallback para Selenium"""
+        html = self.fetch_static_page(url, required_marker)
+        if html is not None:
+            return html
+        
+        if driver is None:
+            driver = self.acquire_driver()
+        
+        if self.safe_get_page(driver, url):
+            return driver.page_source
+        return None
+    
+    def _blocked_status(self, driver: webdriver.Chrome) -> Optional[int]:
+        """Status de bloqueio da resposta do documento principal (Navigation Timing)
+        
+        Uma única chamada pequena ao WebDriver; iframes têm entradas próprias
+        e não afetam o resultado.
+        """
+        try:
+            status = driver.execute_script(_NAVIGATION_STATUS_JS)
+        except Exception as e:
+            logger.debug("Status da navegação indisponível: %s", e)
+            return None
+        return status if status in _BLOCK_STATUS_CODES else None
+    
     def safe_get_page(self, driver: webdriver.Chrome, url: str) -> bool:
         """Carregamento seguro de página com detecção de bloqueio"""
         try:
-            logging.info(f"Carregando: {url}")
+            logger.info("Carregando: %s", url)
             driver.get(url)
             
-            # Verificar se foi bloqueado
-            page_content = driver.page_source.lower()
-            for keyword in self.config.block_detection_keywords:
-                if keyword in page_content:
-                    logging.warning(f"Possível bloqueio detectado: '{keyword}' encontrado")
-                    self.delay_manager.record_error()
-                    return False
+            if driver is self._driver:
+                self._pages_on_driver += 1
+            
+            # Status HTTP do documento decide antes de qualquer leitura do DOM
+            status = self._blocked_status(driver)
+            if status is not None:
+                logger.warning("Possível bloqueio detectado: status %s em %s", status, url)
+                self.delay_manager.record_error()
+                return False
+            
+            # Verificar se foi bloqueado (só título + início do texto visível)
+            snippet = driver.execute_script(_BLOCK_SNIPPET_JS) or ''
+            keyword = self.config.find_block_keyword(snippet)
+            if keyword is not None:
+                logger.warning("Possível bloqueio detectado: '%s' encontrado", keyword)
+                self.delay_manager.record_error()
+                return False
             
             self.delay_manager.record_success()
             return True
             
         except Exception as e:
-            logging.error(f"Erro carregando página {url}: {e}")
+            logger.error("Erro carregando página %s: %s", url, e)
             self.delay_manager.record_error()
             return False
 
@@ -217,23 +611,68 @@ class AntiDetectionDriver:
 class PerformanceOptimizer:
     """Otimizador de performance para extração em massa"""
     
+    __slots__ = ('config', 'pages_processed', 'prompts_extracted', 'errors',
+                 'start_time', '_category_index', '_category_seconds',
+                 '_success_threshold', '_max_pages')
+    
     def __init__(self, config: ScrapingConfig):
         self.config = config
-        self.stats = {
-            'pages_processed': 0,
-            'prompts_extracted': 0,
-            'errors': 0,
-            'start_time': time.time(),
-            'category_times': {}
+        # Limites lidos a cada página - copiados uma vez da configuração
+        self._success_threshold = config.success_threshold
+        self._max_pages = config.max_pages_per_category
+        self.pages_processed = 0
+        self.prompts_extracted = 0
+        self.errors = 0
+        self.start_time = time.monotonic()
+        # Tempos por categoria em array contíguo de float64 + índice nome -> posição
+        self._category_index: Dict[str, int] = {}
+        self._category_seconds = array('d')
+    
+    def record_category_time(self, category_name: str, seconds: float):
+        """Acumula o tempo gasto em uma categoria"""
+        index = self._category_index.get(category_name)
+        if index is None:
+            index = self._category_index[category_name] = len(self._category_seconds)
+            self._category_seconds.append(0.0)
+        self._category_seconds[index] += seconds
+    
+    @property
+    def category_times(self) -> Dict[str, float]:
+        """Tempos por categoria em dicionário (montado apenas sob demanda)"""
+        seconds = self._category_seconds
+        return {name: seconds[index] for name, index in self._category_index.items()}
+    
+    def category_time_summary(self) -> Dict[str, float]:
+        """Média e p95 dos tempos por categoria"""
+        seconds = self._category_seconds
+        if not seconds:
+            return {'mean': 0.0, 'p95': 0.0}
+        if len(seconds) == 1:
+            return {'mean': seconds[0], 'p95': seconds[0]}
+        return {
+            'mean': statistics.fmean(seconds),
+            'p95': statistics.quantiles(seconds, n=20, method='inclusive')[-1]
+        }
+    
+    @property
+    def stats(self) -> Dict:
+        """Visão em dicionário dos contadores (compatibilidade com o formato antigo)"""
+        return {
+            'pages_processed': self.pages_processed,
+            'prompts_extracted': self.prompts_extracted,
+            'errors': self.errors,
+            'start_time': self.start_time,
+            'category_times': self.category_times
         }
     
     def estimate_time_remaining(self, categories_remaining: int) -> str:
         """Estima tempo restante baseado na performance atual"""
-        if self.stats['pages_processed'] == 0:
+        pages = self.pages_processed
+        if pages == 0:
             return "Calculando..."
         
-        elapsed = time.time() - self.stats['start_time']
-        avg_time_per_page = elapsed / self.stats['pages_processed']
+        elapsed = time.monotonic() - self.start_time
+        avg_time_per_page = elapsed / pages
         
         # Estimativa conservadora (assume 10 páginas por categoria)
         estimated_pages = categories_remaining * 10
@@ -248,37 +687,49 @@ class PerformanceOptimizer:
     
     def get_performance_report(self) -> Dict:
         """Gera relatório de performance detalhado"""
-        elapsed = time.time() - self.stats['start_time']
+        pages = self.pages_processed
+        prompts = self.prompts_extracted
+        elapsed = time.monotonic() - self.start_time
+        
+        # Denominadores protegidos calculados uma única vez
+        safe_pages = pages or 1
+        safe_seconds = elapsed if elapsed > 1 else 1
+        safe_minutes = elapsed / 60 if elapsed > 60 else 1
         
         return {
             'tempo_total': f"{elapsed:.1f}s",
-            'páginas_processadas': self.stats['pages_processed'],
-            'prompts_extraídos': self.stats['prompts_extracted'],
-            'taxa_de_erro': f"{(self.stats['errors'] / max(self.stats['pages_processed'], 1)) * 100:.1f}%",
-            'prompts_por_segundo': f"{self.stats['prompts_extracted'] / max(elapsed, 1):.2f}",
-            'páginas_por_minuto': f"{self.stats['pages_processed'] / max(elapsed/60, 1):.1f}",
-            'tempos_por_categoria': self.stats['category_times']
+            'páginas_processadas': pages,
+            'prompts_extraídos': prompts,
+            'taxa_de_erro': f"{(self.errors / safe_pages) * 100:.1f}%",
+            'prompts_por_segundo': f"{prompts / safe_seconds:.2f}",
+            'páginas_por_minuto': f"{pages / safe_minutes:.1f}",
+            'tempos_por_categoria': self.category_times,
+            'resumo_tempos_categoria': self.category_time_summary()
         }
     
     def should_continue_category(self, category_name: str, current_page: int, 
                                 success_rate: float) -> bool:
         """Decide se deve continuar processando uma categoria"""
+        # Caminho comum primeiro: dentro do limite e taxa de sucesso aceitável
+        if current_page < self._max_pages and (current_page <= 3 or success_rate >= self._success_threshold):
+            return True
+        
         # Parar se taxa de sucesso muito baixa
-        if success_rate < self.config.success_threshold and current_page > 3:
-            logging.warning(f"Taxa de sucesso baixa para {category_name}: {success_rate:.2f}")
+        if current_page > 3 and success_rate < self._success_threshold:
+            logger.warning("Taxa de sucesso baixa para %s: %.2f", category_name, success_rate)
             return False
         
         # Respeitar limite máximo de páginas
-        if current_page >= self.config.max_pages_per_category:
-            logging.info(f"Limite de páginas atingido para {category_name}")
-            return False
-        
-        return True
+        logger.info("Limite de páginas atingido para %s", category_name)
+        return False
 
 
 class CircuitBreaker:
     """Circuit Breaker para proteger contra falhas em cascata"""
     
+    __slots__ = ('failure_threshold', 'recovery_timeout', 'failure_count',
+                 'last_failure_time', 'state')
+    
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 300):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
@@ -289,9 +740,9 @@ class CircuitBreaker:
     def call(self, func, *args, **kwargs):
         """Executa função com proteção do circuit breaker"""
         if self.state == 'OPEN':
-            if time.time() - self.last_failure_time > self.recovery_timeout:
+            if time.monotonic() - self.last_failure_time > self.recovery_timeout:
                 self.state = 'HALF_OPEN'
-                logging.info("Circuit breaker mudou para HALF_OPEN")
+                logger.info("Circuit breaker mudou para HALF_OPEN")
             else:
                 raise Exception("Circuit breaker está OPEN - muitas falhas")
         
@@ -302,17 +753,17 @@ class CircuitBreaker:
             if self.state == 'HALF_OPEN':
                 self.state = 'CLOSED'
                 self.failure_count = 0
-                logging.info("Circuit breaker voltou para CLOSED")
+                logger.info("Circuit breaker voltou para CLOSED")
             
             return result
             
         except Exception as e:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = time.monotonic()
             
             if self.failure_count >= self.failure_threshold:
                 self.state = 'OPEN'
-                logging.error(f"Circuit breaker ABERTO após {self.failure_count} falhas")
+                logger.error("Circuit breaker ABERTO após %d falhas", self.failure_count)
             
             raise e
 
@@ -322,6 +773,9 @@ def create_enhanced_scraper(config: ScrapingConfig = None):
     if config is None:
         config = ScrapingConfig()
     
+    if config.dns_cache_ttl > 0:
+        install_dns_cache(config.dns_cache_ttl)
+    
     return {
         'driver_manager': AntiDetectionDriver(config),
         'performance': PerformanceOptimizer(config),
@@ -345,18 +799,13 @@ if __name__ == "__main__":
     driver_manager = components['driver_manager']
     perf = components['performance']
     
-    # Exemplo de uso
-    driver = driver_manager.create_driver()
-    
-    try:
+    # Exemplo de uso: um único driver reaproveitado entre páginas
+    with driver_manager.driver_pool(max_pages_before_rotate=25) as get_driver:
         # Simular carregamento de página
-        success = driver_manager.safe_get_page(driver, "https://www.godofprompt.ai")
+        success = driver_manager.safe_get_page(get_driver(), "https://www.godofprompt.ai")
         
         if success:
             print("Página carregada com sucesso!")
             print("Relatório de performance:", perf.get_performance_report())
         else:
             print("Falha no carregamento")
-    
-    finally:
-        driver.quit()
\ No newline at end of file
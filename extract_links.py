@@ -3,21 +3,132 @@
 Script completo para extrair TODOS os links dos prompts do godofprompt.ai
 """
 
+import asyncio
+import hashlib
 import requests
 from bs4 import BeautifulSoup
 import yaml
 import json
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, urljoin
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import logging
+import multiprocessing
+import multiprocessing.util
 import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import Counter
 from datetime import datetime
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Loader/Dumper em C (libyaml) quando disponível
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+try:
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+    LXML_CSS_AVAILABLE = True
+except ImportError:
+    LXML_CSS_AVAILABLE = False
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Recursos desnecessários para ler atributos wized e texto dos prompts
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.managed_default_content_settings.media_stream": 2
+}
+
+# Limite de páginas por categoria para evitar loops infinitos
+MAX_PAGES_PER_CATEGORY = 50
+
+# Conexões HTTP simultâneas na extração de listagens
+HTTP_CONNECTION_LIMIT = 20
+
+# Conexões simultâneas por host (cortesia com o servidor)
+HTTP_CONNECTIONS_PER_HOST = 4
+
+# Categorias processadas ao mesmo tempo na extração HTTP
+CATEGORY_CONCURRENCY = 8
+
+# Navegadores paralelos (um processo por Chrome) no fallback com Selenium
+SELENIUM_WORKERS = 4
+
+# Páginas de prompt baixadas simultaneamente na extração de conteúdo
+CONTENT_CONCURRENCY = 20
+
+# Teto de requisições por segundo na extração de conteúdo (token bucket)
+CONTENT_REQUESTS_PER_SECOND = 10
+
+# Throttling adaptativo: 429/503 dobram o período do limitador (até 16x);
+# após N respostas boas seguidas ele volta a cair pela metade até o original
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_MAX_FACTOR = 16
+THROTTLE_RECOVERY_STREAK = 20
+
+# Cache persistente dos prompts já extraídos (permite retomar execuções)
+RESUME_DB_PATH = "extraction_state.db"
+
+# Cache HTTP das páginas de listagem (revalidadas com ETag/Last-Modified)
+LISTING_CACHE_PATH = "listing_cache.db"
+
+# Threads para gravar os arquivos Markdown (sobrepõe as syscalls de escrita)
+WRITE_WORKERS = 32
+
+# Seletores candidatos para o conteúdo do prompt (em ordem de preferência)
+CONTENT_SELECTORS = [
+    '[data-wized="prompt_content"]',
+    '.prompt-content',
+    '.content',
+    'main',
+    'article',
+    '.prompt-text',
+    '[class*="content"]',
+    '[class*="prompt"]'
+]
+
+# Seletores compilados uma única vez (lxml + cssselect)
+COMPILED_CONTENT_SELECTORS = [CSSSelector(selector) for selector in CONTENT_SELECTORS] if LXML_CSS_AVAILABLE else []
+
+def json_bytes(data, indent=False):
+    """Serializa para JSON em UTF-8 (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+def loads_json(data):
+    """Decodifica JSON (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def setup_logging():
     """Configura o sistema de logging"""
     logging.basicConfig(
@@ -32,7 +143,7 @@ def setup_logging():
 def load_categories():
     """Carrega as categorias do arquivo links.yaml"""
     with open('links.yaml', 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=YamlLoader)
     return data['categoriasDePrompt']
 
 def create_driver():
@@ -43,93 +154,171 @@ def create_driver():
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("prefs", CHROME_PREFS)
+
+    # driver.get retorna no DOMContentLoaded, sem esperar imagens/subrecursos
+    chrome_options.page_load_strategy = 'eager'
 
     return webdriver.Chrome(options=chrome_options)
 
+# Marca a página como estável após DOM_QUIET_MS sem mutações na árvore
+STABILITY_OBSERVER_JS = """
+const quietMs = arguments[0];
+window.__promptsStable = false;
+if (window.__promptsObserver) {
+    window.__promptsObserver.disconnect();
+}
+let timer = setTimeout(() => { window.__promptsStable = true; }, quietMs);
+window.__promptsObserver = new MutationObserver(() => {
+    window.__promptsStable = false;
+    clearTimeout(timer);
+    timer = setTimeout(() => { window.__promptsStable = true; }, quietMs);
+});
+window.__promptsObserver.observe(document.body, {childList: true, subtree: true});
+"""
+
+PROMPTS_READY_JS = "return window.__promptsStable === true && document.querySelectorAll('[wized=\"plp_prompt_item_all\"]').length > 0"
+
+# Localizadores e condições reutilizados (evita recriá-los a cada chamada)
+NEXT_BUTTON_LOCATOR = (By.CSS_SELECTOR, '[wized="pagin-next"]')
+PROMPT_ITEM_LOCATOR = (By.CSS_SELECTOR, '[wized="plp_prompt_item_all"]')
+BODY_LOCATOR = (By.TAG_NAME, "body")
+NEXT_BUTTON_CLICKABLE = EC.element_to_be_clickable(NEXT_BUTTON_LOCATOR)
+BODY_PRESENT = EC.presence_of_element_located(BODY_LOCATOR)
+
+def get_wait(driver, timeout=10):
+    """WebDriverWait reutilizado por driver e timeout"""
+    waits = driver.__dict__.setdefault('_cached_waits', {})
+    wait = waits.get(timeout)
+    if wait is None:
+        wait = waits[timeout] = WebDriverWait(driver, timeout)
+    return wait
+
+# Janela sem mutações no DOM para considerar a listagem carregada
+DOM_QUIET_MS = 300
+
 def wait_for_prompts_to_load(driver, timeout=30):
-    """Aguarda o carregamento dos prompts na página"""
+    """Aguarda os prompts aparecerem e o DOM parar de mudar"""
     try:
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.querySelectorAll('[wized=\"plp_prompt_item_all\"]').length > 0")
+        driver.execute_script(STABILITY_OBSERVER_JS, DOM_QUIET_MS)
+        get_wait(driver, timeout).until(
+            lambda d: d.execute_script(PROMPTS_READY_JS)
         )
-        time.sleep(2)  # Espera extra para garantir carregamento completo
         return True
     except Exception as e:
         logging.error(f"Erro aguardando carregamento dos prompts: {e}")
         return False
 
-def extract_prompts_from_page(driver):
-    """Extrai os prompts da página atual"""
-    script = """
-    return Array.from(document.querySelectorAll('[wized="plp_prompt_item_all"]')).map(el => {
-        const linkElement = el.querySelector('[wized="plp_prompt_item_link"]');
-        const nameElement = el.querySelector('[wized="plp_prompt_name"]');
-        const idElement = el.querySelector('[wized="plp_prompt_id"]');
+# Expressões JS reutilizadas isoladamente e no script combinado de estado
+PROMPT_ITEMS_JS = """
+    (() => {
+        const category = window.location.search.includes('category=') ?
+            new URLSearchParams(window.location.search).get('category') : 'unknown';
+
+        return Array.from(document.querySelectorAll('[wized="plp_prompt_item_all"]')).map(el => {
+            const linkElement = el.querySelector('[wized="plp_prompt_item_link"]');
+            const nameElement = el.querySelector('[wized="plp_prompt_name"]');
+            const idElement = el.querySelector('[wized="plp_prompt_id"]');
+
+            return {
+                url: linkElement ? linkElement.href : null,
+                name: nameElement ? nameElement.textContent.trim() : '',
+                id: idElement ? idElement.textContent.trim() : '',
+                category: category
+            };
+        });
+    })()
+"""
+
+PAGINATION_JS = """
+    (() => {
+        const nextBtn = document.querySelector('[wized="pagin-next"]');
+        const currentPageEl = document.querySelector('[wized="pagin-cur-page"]');
+        const totalPagesEl = document.querySelector('[wized="pagin-all-pages"]');
 
         return {
-            url: linkElement ? linkElement.href : null,
-            name: nameElement ? nameElement.textContent.trim() : '',
-            id: idElement ? idElement.textContent.trim() : '',
-            category: window.location.search.includes('category=') ?
-                new URLSearchParams(window.location.search).get('category') : 'unknown'
+            hasNext: nextBtn && !nextBtn.disabled && nextBtn.style.display !== 'none',
+            currentPage: currentPageEl ? parseInt(currentPageEl.textContent) : 1,
+            totalPages: totalPagesEl ? parseInt(totalPagesEl.textContent) : 1
         };
-    });
-    """
+    })()
+"""
+
+# Prompts + paginação em um único round-trip ao driver, serializados no navegador
+# como uma única string JSON (decodificada com orjson em vez de objeto a objeto)
+PAGE_STATE_JS = f"return JSON.stringify({{prompts: {PROMPT_ITEMS_JS}, pagination: {PAGINATION_JS}}});"
+
+DEFAULT_PAGINATION = {'hasNext': False, 'currentPage': 1, 'totalPages': 1}
+
+def _valid_prompts(prompts):
+    """Filtra prompts sem link e garante URLs absolutas"""
+    valid_prompts = []
+
+    for prompt in prompts:
+        if prompt['url'] and prompt['url'] != '#':
+            # Garantir URL absoluta
+            if prompt['url'].startswith('/'):
+                prompt['url'] = f"https://www.godofprompt.ai{prompt['url']}"
 
+            valid_prompts.append({
+                'url': prompt['url'],
+                'name': prompt['name'],
+                'id': prompt['id'],
+                'category': prompt['category']
+            })
+
+    return valid_prompts
+
+def extract_prompts_from_page(driver):
+    """Extrai os prompts da página atual"""
     try:
-        prompts = driver.execute_script(script)
-        valid_prompts = []
-
-        for prompt in prompts:
-            if prompt['url'] and prompt['url'] != '#':
-                # Garantir URL absoluta
-                if prompt['url'].startswith('/'):
-                    prompt['url'] = f"https://www.godofprompt.ai{prompt['url']}"
-
-                valid_prompts.append({
-                    'url': prompt['url'],
-                    'name': prompt['name'],
-                    'id': prompt['id'],
-                    'category': prompt['category']
-                })
-
-        return valid_prompts
+        return _valid_prompts(loads_json(driver.execute_script(f"return JSON.stringify({PROMPT_ITEMS_JS});")))
     except Exception as e:
         logging.error(f"Erro extraindo prompts da página: {e}")
         return []
 
 def get_pagination_info(driver):
     """Obtém informações sobre a paginação"""
-    script = """
-    const nextBtn = document.querySelector('[wized="pagin-next"]');
-    const currentPageEl = document.querySelector('[wized="pagin-cur-page"]');
-    const totalPagesEl = document.querySelector('[wized="pagin-all-pages"]');
+    try:
+        return driver.execute_script(f"return {PAGINATION_JS};")
+    except Exception as e:
+        logging.error(f"Erro obtendo informações de paginação: {e}")
+        return dict(DEFAULT_PAGINATION)
 
-    return {
-        hasNext: nextBtn && !nextBtn.disabled && nextBtn.style.display !== 'none',
-        currentPage: currentPageEl ? parseInt(currentPageEl.textContent) : 1,
-        totalPages: totalPagesEl ? parseInt(totalPagesEl.textContent) : 1
-    };
-    """
+def fetch_page_state(driver):
+    """Extrai prompts e paginação da página atual em uma única chamada
 
+    Retorna (prompts, paginacao).
+    """
     try:
-        return driver.execute_script(script)
+        state = loads_json(driver.execute_script(PAGE_STATE_JS))
+        return _valid_prompts(state['prompts']), state['pagination']
     except Exception as e:
-        logging.error(f"Erro obtendo informações de paginação: {e}")
-        return {'hasNext': False, 'currentPage': 1, 'totalPages': 1}
+        logging.error(f"Erro extraindo estado da página: {e}")
+        return [], dict(DEFAULT_PAGINATION)
 
 def click_next_page(driver):
     """Clica no botão 'próximo' para navegar para a próxima página"""
     try:
-        next_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, '[wized="pagin-next"]'))
-        )
+        # Primeiro item atual: fica obsoleto quando a nova página é renderizada
+        try:
+            first_item = driver.find_element(*PROMPT_ITEM_LOCATOR)
+        except NoSuchElementException:
+            first_item = None
+
+        next_button = get_wait(driver, 10).until(NEXT_BUTTON_CLICKABLE)
         next_button.click()
-        time.sleep(3)  # Espera carregamento da nova página
+
+        if first_item is not None:
+            try:
+                get_wait(driver, 10).until(EC.staleness_of(first_item))
+            except TimeoutException:
+                # Lista atualizada no lugar; wait_for_prompts_to_load cobre o restante
+                logging.debug("Itens da página anterior não foram substituídos")
         return True
     except Exception as e:
         logging.error(f"Erro clicando no botão próximo: {e}")
@@ -154,43 +343,63 @@ def extract_category_links(category, driver=None, should_close_driver=True):
             logging.error(f"Não foi possível carregar prompts para {category['nome']}")
             return []
 
-        # Extrair prompts da primeira página
-        all_prompts = extract_prompts_from_page(driver)
+        # Extrair prompts e paginação da primeira página
+        all_prompts, pagination_info = fetch_page_state(driver)
+        seen_urls = {prompt['url'] for prompt in all_prompts}
         logging.info(f"Página 1: {len(all_prompts)} prompts encontrados")
 
         # Verificar paginação e extrair das próximas páginas
-        pagination_info = get_pagination_info(driver)
         current_page = pagination_info['currentPage']
         total_pages = pagination_info['totalPages']
 
         logging.info(f"Paginação detectada: Página {current_page} de {total_pages}")
 
-        # Limitar a 50 páginas por categoria para evitar loops infinitos
-        max_pages = min(total_pages, 50)
+        # Limitar páginas por categoria para evitar loops infinitos
+        max_pages = min(total_pages, MAX_PAGES_PER_CATEGORY)
+
+        # Navegação direta por URL (&page=N); clique no "próximo" como fallback
+        use_page_urls = True
 
         while current_page < max_pages and pagination_info['hasNext']:
-            logging.info(f"Navegando para página {current_page + 1}...")
+            next_page = current_page + 1
+            logging.info(f"Navegando para página {next_page}...")
+
+            if use_page_urls:
+                driver.get(listing_page_url(category['link'], next_page))
+
+                if not wait_for_prompts_to_load(driver):
+                    logging.error(f"Falha no carregamento da página {next_page}")
+                    break
+
+                new_prompts, pagination_info = fetch_page_state(driver)
+
+                # Se o site ignorou o parâmetro estamos de volta na página 1
+                if next_page == 2 and pagination_info['currentPage'] != next_page:
+                    logging.info("Parâmetro de página não suportado - usando botão 'próximo'")
+                    use_page_urls = False
+
+            if not use_page_urls:
+                if not click_next_page(driver):
+                    logging.error(f"Falha ao navegar para página {next_page}")
+                    break
 
-            if not click_next_page(driver):
-                logging.error(f"Falha ao navegar para página {current_page + 1}")
-                break
+                # Aguardar carregamento da nova página
+                if not wait_for_prompts_to_load(driver):
+                    logging.error(f"Falha no carregamento da página {next_page}")
+                    break
 
-            # Aguardar carregamento da nova página
-            if not wait_for_prompts_to_load(driver):
-                logging.error(f"Falha no carregamento da página {current_page + 1}")
-                break
+                # Extrair prompts e paginação da nova página
+                new_prompts, pagination_info = fetch_page_state(driver)
 
-            # Extrair prompts da nova página
-            new_prompts = extract_prompts_from_page(driver)
-            logging.info(f"Página {current_page + 1}: {len(new_prompts)} prompts encontrados")
+            logging.info(f"Página {next_page}: {len(new_prompts)} prompts encontrados")
 
             # Adicionar apenas prompts novos
             for prompt in new_prompts:
-                if not any(p['url'] == prompt['url'] for p in all_prompts):
+                if prompt['url'] not in seen_urls:
+                    seen_urls.add(prompt['url'])
                     all_prompts.append(prompt)
 
             current_page += 1
-            pagination_info = get_pagination_info(driver)
 
         logging.info(f"Extração concluída para {category['nome']}: {len(all_prompts)} prompts únicos")
         return all_prompts
@@ -202,8 +411,272 @@ def extract_category_links(category, driver=None, should_close_driver=True):
         if should_close_driver and driver:
             driver.quit()
 
-def save_links_to_yaml(all_data, filename="links_extraidos.yaml"):
+def category_slug(link):
+    """Retorna o parâmetro 'category' da URL da listagem"""
+    return parse_qs(urlparse(link).query).get('category', ['unknown'])[0]
+
+def listing_page_url(link, page):
+    """Monta a URL de uma página específica da listagem"""
+    separator = '&' if '?' in link else '?'
+    return f"{link}{separator}page={page}"
+
+def parse_listing_html(html, page_url, category):
+    """Extrai prompts e total de páginas do HTML estático de uma listagem
+
+    Mesmos seletores usados no Selenium; retorna (prompts, total_paginas).
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    prompts = []
+
+    for item in soup.select('[wized="plp_prompt_item_all"]'):
+        link_element = item.select_one('[wized="plp_prompt_item_link"]')
+        href = link_element.get('href') if link_element else None
+        if not href or href == '#':
+            continue
+
+        name_element = item.select_one('[wized="plp_prompt_name"]')
+        id_element = item.select_one('[wized="plp_prompt_id"]')
+        prompts.append({
+            'url': urljoin(page_url, href),
+            'name': name_element.get_text(strip=True) if name_element else '',
+            'id': id_element.get_text(strip=True) if id_element else '',
+            'category': category
+        })
+
+    total_pages = 1
+    total_pages_element = soup.select_one('[wized="pagin-all-pages"]')
+    if total_pages_element:
+        try:
+            total_pages = int(total_pages_element.get_text(strip=True))
+        except ValueError:
+            pass
+
+    return prompts, total_pages
+
+class ListingCache:
+    """Cache HTTP em SQLite das páginas de listagem
+
+    Guarda corpo, ETag e Last-Modified por URL para GETs condicionais: um
+    304 reaproveita o corpo salvo. Categorias cuja quantidade de prompts
+    cresceu desde a última execução têm suas páginas descartadas.
+    """
+
+    def __init__(self, db_path=LISTING_CACHE_PATH):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS categories (link TEXT PRIMARY KEY, expected INTEGER)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def sync_categories(self, categories):
+        """Invalida as categorias que ganharam prompts e registra as quantidades atuais"""
+        known = dict(self.conn.execute("SELECT link, expected FROM categories"))
+        for category in categories:
+            link = category['link']
+            expected = category['quantidadeDePrompts']
+            if link in known and expected > known[link]:
+                logging.info(f"{category['nome']} cresceu ({known[link]} -> {expected}) - revalidando listagem")
+                self.conn.execute("DELETE FROM pages WHERE url = ? OR url LIKE ? OR url LIKE ?",
+                                  (link, f"{link}?%", f"{link}&%"))
+            self.conn.execute("INSERT OR REPLACE INTO categories (link, expected) VALUES (?, ?)", (link, expected))
+        self.conn.commit()
+
+    def conditional_headers(self, url):
+        """Headers If-None-Match/If-Modified-Since para a URL (vazio se não cacheada)"""
+        row = self.conn.execute("SELECT etag, last_modified FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return {}
+
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def body(self, url):
+        row = self.conn.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, url, etag, last_modified, body):
+        # Sem validadores não há como revalidar: não vale guardar
+        if not etag and not last_modified:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (url, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+            (url, etag, last_modified, body)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+async def fetch_listing_html(session, url, cache=None, limiter=None):
+    """Baixa o HTML de uma página de listagem; None em caso de erro
+
+    Com cache, faz GET condicional e reaproveita o corpo salvo em um 304.
+    Com limiter (AsyncRateLimiter), respeita o ritmo e informa o status.
+    """
+    headers = cache.conditional_headers(url) if cache else None
+    if limiter is not None:
+        await limiter.acquire()
+    try:
+        async with session.get(url, headers=headers) as response:
+            if limiter is not None:
+                limiter.record_status(response.status)
+            if response.status == 304 and cache:
+                cached_body = cache.body(url)
+                if cached_body is not None:
+                    return cached_body
+            if response.status != 200:
+                logging.warning(f"Status code {response.status} para {url}")
+                return None
+            html = await response.text()
+            if cache:
+                cache.store(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), html)
+            return html
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.warning(f"Erro HTTP carregando {url}: {e}")
+        return None
+
+async def fetch_category(session, category, cache=None, limiter=None):
+    """Extrai todos os links de uma categoria via HTTP
+
+    Retorna None quando a listagem depende de JavaScript (sem marcadores de
+    prompt no HTML estático) - nesse caso a categoria vai para o Selenium.
+    """
+    link = category['link']
+    slug = category_slug(link)
+
+    html = await fetch_listing_html(session, link, cache, limiter)
+    if html is None:
+        return None
+
+    all_prompts, total_pages = parse_listing_html(html, link, slug)
+    if not all_prompts:
+        logging.info(f"Listagem de {category['nome']} renderizada via JavaScript - usando Selenium")
+        return None
+
+    max_pages = min(total_pages, MAX_PAGES_PER_CATEGORY)
+    logging.info(f"{category['nome']} via HTTP: página 1 com {len(all_prompts)} prompts, {max_pages} páginas")
+
+    page_urls = [listing_page_url(link, page) for page in range(2, max_pages + 1)]
+    pages_html = await asyncio.gather(*(fetch_listing_html(session, url, cache, limiter)
+                                        for url in page_urls))
+
+    seen_urls = {prompt['url'] for prompt in all_prompts}
+    for page, page_html in enumerate(pages_html, 2):
+        if page_html is None:
+            logging.error(f"Falha no carregamento da página {page} de {category['nome']}")
+            continue
+
+        new_prompts, _ = parse_listing_html(page_html, page_urls[page - 2], slug)
+        for prompt in new_prompts:
+            if prompt['url'] not in seen_urls:
+                seen_urls.add(prompt['url'])
+                all_prompts.append(prompt)
+
+    logging.info(f"Extração HTTP concluída para {category['nome']}: {len(all_prompts)} prompts únicos")
+    return all_prompts
+
+async def extract_categories_http(categories, cache=None):
+    """Extrai as listagens de todas as categorias concorrentemente via aiohttp
+
+    Retorna {nome_categoria: prompts}; o valor é None para categorias que
+    precisam do fallback com Selenium. Com um ListingCache, as páginas são
+    revalidadas com GETs condicionais.
+    """
+    semaphore = asyncio.Semaphore(CATEGORY_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT,
+                                     limit_per_host=HTTP_CONNECTIONS_PER_HOST)
+    # Sem timeout total: a espera por uma conexão livre no pool não conta como falha
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=30)
+
+    async def bounded_fetch(session, category):
+        async with semaphore:
+            return await fetch_category(session, category, cache)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': USER_AGENT}) as session:
+        results = await asyncio.gather(*(bounded_fetch(session, category) for category in categories))
+
+    return {category['nome']: prompts for category, prompts in zip(categories, results)}
+
+def collect_http_listings(categories, cache=None):
+    """Executa a extração HTTP quando o aiohttp está disponível"""
+    if not AIOHTTP_AVAILABLE:
+        logging.info("aiohttp não disponível - listagens serão extraídas com Selenium")
+        return {}
+
+    if cache:
+        cache.sync_categories(categories)
+
+    logging.info("Extraindo listagens via HTTP (aiohttp)")
+    return asyncio.run(extract_categories_http(categories, cache))
+
+# Driver do processo worker (Selenium não é thread-safe, mas funciona entre processos)
+_worker_driver = None
+
+def _init_worker():
+    """Inicializa um worker do pool (o Chrome só é criado na primeira categoria)"""
+    setup_logging()
+
+def _run_category(category):
+    """Extrai uma categoria usando o driver do worker
+
+    O driver é criado aqui, e não no initializer: uma falha ao iniciar o
+    Chrome vira exceção da tarefa e chega ao processo principal, em vez de
+    derrubar o worker (que o pool recriaria indefinidamente).
+    """
+    global _worker_driver
+    if _worker_driver is None:
+        _worker_driver = create_driver()
+        # Finalize roda na saída normal do worker (pool.close + join)
+        multiprocessing.util.Finalize(_worker_driver, _worker_driver.quit, exitpriority=10)
+    return extract_category_links(category, driver=_worker_driver, should_close_driver=False)
+
+def extract_categories_selenium(categories):
+    """Extrai categorias com Selenium, uma por processo quando houver mais de uma
+
+    Retorna {nome_categoria: prompts}.
+    """
+    if not categories:
+        return {}
+
+    if len(categories) == 1:
+        return {categories[0]['nome']: extract_category_links(categories[0])}
+
+    workers = min(SELENIUM_WORKERS, len(categories))
+    logging.info(f"Extraindo {len(categories)} categorias com Selenium em {workers} processos")
+
+    pool = multiprocessing.Pool(workers, initializer=_init_worker)
+    try:
+        results = pool.map(_run_category, categories)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    return {category['nome']: prompts for category, prompts in zip(categories, results)}
+
+def count_prompts(all_data):
+    """Contador {nome_categoria: quantidade de prompts}"""
+    return Counter({cat_name: len(cat_data['prompts']) for cat_name, cat_data in all_data.items()})
+
+def save_links_to_yaml(all_data, filename="links_extraidos.yaml", prompt_counts=None):
     """Salva apenas os links em formato YAML estruturado"""
+    if prompt_counts is None:
+        prompt_counts = count_prompts(all_data)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename_with_timestamp = f"{timestamp}_{filename}"
 
@@ -212,27 +685,30 @@ def save_links_to_yaml(all_data, filename="links_extraidos.yaml"):
         'metadata': {
             'data_extracao': datetime.now().isoformat(),
             'total_categorias': len(all_data),
-            'total_prompts': sum(len(cat_data['prompts']) for cat_data in all_data.values())
+            'total_prompts': sum(prompt_counts.values())
         },
         'categorias': {}
     }
 
     for cat_name, cat_data in all_data.items():
         yaml_data['categorias'][cat_name] = {
-            'quantidade_extraida': len(cat_data['prompts']),
+            'quantidade_extraida': prompt_counts[cat_name],
             'quantidade_esperada': cat_data['quantidade_esperada'],
             'links': [prompt['url'] for prompt in cat_data['prompts']]
         }
 
     # Salvar arquivo YAML
     with open(filename_with_timestamp, 'w', encoding='utf-8') as f:
-        yaml.dump(yaml_data, f, allow_unicode=True, default_flow_style=False, indent=2)
+        yaml.dump(yaml_data, f, Dumper=YamlDumper, allow_unicode=True, default_flow_style=False, indent=2)
 
     logging.info(f"Links salvos em YAML: {filename_with_timestamp}")
     return filename_with_timestamp
 
-def save_results(all_data, filename="todos_os_links.json"):
+def save_results(all_data, filename="todos_os_links.json", prompt_counts=None):
     """Salva os resultados em arquivo JSON"""
+    if prompt_counts is None:
+        prompt_counts = count_prompts(all_data)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename_with_timestamp = f"{timestamp}_{filename}"
 
@@ -240,13 +716,13 @@ def save_results(all_data, filename="todos_os_links.json"):
     stats = {
         'data_extracao': datetime.now().isoformat(),
         'total_categorias': len(all_data),
-        'total_prompts': sum(len(cat_data['prompts']) for cat_data in all_data.values()),
+        'total_prompts': sum(prompt_counts.values()),
         'categorias': {}
     }
 
     for cat_name, cat_data in all_data.items():
         stats['categorias'][cat_name] = {
-            'quantidade_extraida': len(cat_data['prompts']),
+            'quantidade_extraida': prompt_counts[cat_name],
             'quantidade_esperada': cat_data['quantidade_esperada'],
             'url_base': cat_data['url_base']
         }
@@ -258,12 +734,19 @@ def save_results(all_data, filename="todos_os_links.json"):
     }
 
     # Salvar arquivo
-    with open(filename_with_timestamp, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    with open(filename_with_timestamp, 'wb') as f:
+        f.write(json_bytes(result, indent=True))
 
     logging.info(f"Resultados salvos em: {filename_with_timestamp}")
     return filename_with_timestamp
 
+# Marcador de prompt sem conteúdo: não recebe hash (não é deduplicado)
+CONTENT_NOT_FOUND = "Conteúdo não encontrado"
+
+def content_hash(text):
+    """SHA1 do conteúdo, usado para deduplicar prompts repetidos entre categorias"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
 def extract_prompt_content(driver, prompt_url, prompt_name, category_name):
     """Extrai o conteúdo completo de um prompt individual"""
     try:
@@ -271,42 +754,22 @@ def extract_prompt_content(driver, prompt_url, prompt_name, category_name):
         driver.get(prompt_url)
 
         # Aguardar carregamento da página
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        get_wait(driver, 10).until(BODY_PRESENT)
         time.sleep(2)  # Aguardar carregamento dinâmico
 
-        # Tentar diferentes seletores para o conteúdo do prompt
-        content_selectors = [
-            '[data-wized="prompt_content"]',
-            '.prompt-content',
-            '.content',
-            'main',
-            'article',
-            '.prompt-text',
-            '[class*="content"]',
-            '[class*="prompt"]'
-        ]
-
-        prompt_content = ""
-        for selector in content_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    # Pegar o elemento com mais texto
-                    best_element = max(elements, key=lambda e: len(e.text.strip()))
-                    if len(best_element.text.strip()) > len(prompt_content):
-                        prompt_content = best_element.text.strip()
-            except Exception:
-                continue
+        # Seletores aplicados em Python sobre o HTML (sem um .text RPC por elemento)
+        prompt_content = extract_content_from_html(driver.page_source)
 
         # Se não encontrou conteúdo específico, pegar o texto principal da página
         if not prompt_content:
             try:
-                body = driver.find_element(By.TAG_NAME, "body")
+                body = driver.find_element(*BODY_LOCATOR)
                 prompt_content = body.text.strip()
             except Exception:
-                prompt_content = "Conteúdo não encontrado"
+                prompt_content = CONTENT_NOT_FOUND
+
+        # Prompts sem conteúdo não são referências uns dos outros
+        has_content = bool(prompt_content) and prompt_content != CONTENT_NOT_FOUND
 
         return {
             'url': prompt_url,
@@ -314,7 +777,8 @@ def extract_prompt_content(driver, prompt_url, prompt_name, category_name):
             'category': category_name,
             'content': prompt_content,
             'extracted_at': datetime.now().isoformat(),
-            'content_length': len(prompt_content)
+            'content_length': len(prompt_content),
+            'content_hash': content_hash(prompt_content) if has_content else None
         }
 
     except Exception as e:
@@ -328,37 +792,372 @@ def extract_prompt_content(driver, prompt_url, prompt_name, category_name):
             'content_length': 0
         }
 
-def save_prompts_to_directory(all_data, base_dir="prompts_extraidos"):
-    """Salva cada prompt em um arquivo separado em diretório organizado"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = f"{timestamp}_{base_dir}"
+def _extract_content_lxml(html):
+    """Versão de extract_content_from_html com lxml.html e seletores pré-compilados"""
+    document = lxml_html.fromstring(html)
 
-    # Criar diretórios
-    os.makedirs(output_dir, exist_ok=True)
+    # Scripts e estilos não fazem parte do texto visível
+    for element in document.xpath('//script|//style'):
+        element.drop_tree()
 
-    # Estatísticas
-    total_saved = 0
-    categories_stats = {}
+    prompt_content = ""
+    for selector in COMPILED_CONTENT_SELECTORS:
+        for element in selector(document):
+            # Pegar o elemento com mais texto
+            text = "\n".join(part.strip() for part in element.itertext() if part.strip())
+            if len(text) > len(prompt_content):
+                prompt_content = text
 
-    # Salvar cada categoria em subdiretório
-    for cat_name, cat_data in all_data.items():
-        cat_dir = os.path.join(output_dir, cat_name.replace(" ", "_").lower())
-        os.makedirs(cat_dir, exist_ok=True)
+    return prompt_content
+
+def extract_content_from_html(html):
+    """Extrai o conteúdo do prompt do HTML estático (mesmos seletores do Selenium)
+
+    Retorna string vazia quando nenhum seletor casa - sinal de página
+    renderizada via JavaScript.
+    """
+    if not html or not html.strip():
+        return ""
+
+    if LXML_CSS_AVAILABLE:
+        return _extract_content_lxml(html)
+
+    soup = BeautifulSoup(html, 'lxml')
+    prompt_content = ""
+
+    for selector in CONTENT_SELECTORS:
+        for element in soup.select(selector):
+            # Pegar o elemento com mais texto
+            text = element.get_text('\n', strip=True)
+            if len(text) > len(prompt_content):
+                prompt_content = text
+
+    return prompt_content
+
+class AsyncRateLimiter:
+    """Token bucket assíncrono: no máximo max_rate entradas por time_period
+
+    Só espera quando o balde está vazio - respostas rápidas não pagam pausa fixa.
+    Com record_status, o período se adapta a sinais de throttling do servidor.
+    """
+
+    def __init__(self, max_rate, time_period=1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._base_period = time_period
+        self._ok_streak = 0
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = None
+
+    def record_status(self, status):
+        """Ajusta o ritmo pelo status HTTP: recua em 429/503, recupera após sucessos"""
+        if status in THROTTLE_STATUSES:
+            self._ok_streak = 0
+            slowed = min(self.time_period * 2, self._base_period * THROTTLE_MAX_FACTOR)
+            if slowed != self.time_period:
+                self.time_period = slowed
+                logging.warning(f"Status {status}: reduzindo para {self.max_rate} req/{slowed:.0f}s")
+        elif status < 400 and self.time_period > self._base_period:
+            self._ok_streak += 1
+            if self._ok_streak >= THROTTLE_RECOVERY_STREAK:
+                self._ok_streak = 0
+                self.time_period = max(self._base_period, self.time_period / 2)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def acquire(self):
+        """Aguarda (sem bloquear o event loop) até haver um token disponível"""
+        # Lock criado dentro do event loop em uso
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.max_rate / self.time_period
+                self._tokens = min(self.max_rate, self._tokens + refill)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+async def fetch_prompt(session, semaphore, limiter, prompt, category_name):
+    """Baixa e extrai o conteúdo de um prompt via HTTP; None se precisar do Selenium"""
+    async with semaphore, limiter:
+        try:
+            async with session.get(prompt['url'], timeout=aiohttp.ClientTimeout(total=15)) as response:
+                limiter.record_status(response.status)
+                if response.status != 200:
+                    logging.warning(f"Status code {response.status} para {prompt['url']}")
+                    return None
+                html = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            logging.warning(f"Erro HTTP carregando {prompt['url']}: {e}")
+            return None
+
+    # Falha de parsing afeta só este prompt (volta para o Selenium)
+    try:
+        prompt_content = extract_content_from_html(html)
+    except Exception as e:
+        logging.warning(f"Erro extraindo conteúdo de {prompt['url']}: {e}")
+        return None
+    if not prompt_content:
+        return None
+
+    return {
+        'url': prompt['url'],
+        'name': prompt['name'],
+        'category': category_name,
+        'content': prompt_content,
+        'extracted_at': datetime.now().isoformat(),
+        'content_length': len(prompt_content),
+        'content_hash': content_hash(prompt_content)
+    }
+
+class ExtractionState:
+    """Registro em SQLite dos prompts cujo conteúdo já foi extraído
+
+    Só com resume=True (--resume) os prompts concluídos na execução
+    anterior são pulados, e output_dir aponta para o diretório de saída
+    dela, que é completado em vez de criar outro. Sem resume (ou se aquele
+    diretório não existe mais) o registro recomeça do zero.
+    """
+
+    COMMIT_EVERY = 100
+
+    def __init__(self, db_path=RESUME_DB_PATH, resume=False):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS done (url TEXT PRIMARY KEY, hash TEXT, ts TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'output_dir'").fetchone()
+        self.output_dir = row[0] if row else None
+        if resume and self.output_dir and not os.path.isdir(self.output_dir):
+            logging.warning(f"Diretório da execução anterior não encontrado: {self.output_dir}")
+            resume = False
+        if not resume:
+            self.conn.execute("DELETE FROM done")
+            self.conn.execute("DELETE FROM meta")
+            self.conn.commit()
+            self.output_dir = None
+
+        self.done_urls = {row[0] for row in self.conn.execute("SELECT url FROM done")}
+        self._uncommitted = 0
+
+    def set_output_dir(self, output_dir):
+        """Registra o diretório de saída desta execução (retomado por --resume)"""
+        self.output_dir = output_dir
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('output_dir', ?)", (output_dir,)
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def is_done(self, url):
+        return url in self.done_urls
+
+    def mark_done(self, prompt):
+        """Registra um prompt extraído com sucesso"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO done (url, hash, ts) VALUES (?, ?, ?)",
+            (prompt['url'], prompt.get('content_hash'), prompt.get('extracted_at'))
+        )
+        self.done_urls.add(prompt['url'])
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def content_jobs(all_data, state=None):
+    """Lista [(nome_categoria, indice, prompt)] ainda não extraídos"""
+    return [
+        (cat_name, index, prompt)
+        for cat_name, cat_data in all_data.items()
+        for index, prompt in enumerate(cat_data['prompts'], 1)
+        if state is None or not state.is_done(prompt['url'])
+    ]
+
+async def extract_contents_http(jobs, writer, state=None):
+    """Extrai o conteúdo dos prompts concorrentemente via aiohttp
+
+    Cada prompt é gravado pelo writer (e registrado no state) assim que
+    extraído. Retorna a lista [(nome_categoria, indice, prompt)] dos que
+    precisam do Selenium.
+    """
+    semaphore = asyncio.Semaphore(CONTENT_CONCURRENCY)
+    limiter = AsyncRateLimiter(CONTENT_REQUESTS_PER_SECOND)
+    connector = aiohttp.TCPConnector(limit=CONTENT_CONCURRENCY)
+
+    # URLs presentes em mais de uma categoria são baixadas uma única vez
+    remaining_uses = Counter(prompt['url'] for _, _, prompt in jobs)
+    duplicated_urls = {url for url, count in remaining_uses.items() if count > 1}
+    shared_fetches = {}
+
+    async with aiohttp.ClientSession(connector=connector,
+                                     headers={'User-Agent': USER_AGENT}) as session:
+        async def fetch_and_write(cat_name, index, prompt):
+            url = prompt['url']
+            if url in duplicated_urls:
+                task = shared_fetches.get(url)
+                if task is None:
+                    task = shared_fetches[url] = asyncio.ensure_future(
+                        fetch_prompt(session, semaphore, limiter, prompt, cat_name)
+                    )
+                full_prompt = await task
+
+                # Liberar o resultado após o último uso
+                remaining_uses[url] -= 1
+                if remaining_uses[url] == 0:
+                    del shared_fetches[url]
+            else:
+                full_prompt = await fetch_prompt(session, semaphore, limiter, prompt, cat_name)
+
+            if full_prompt is None:
+                return cat_name, index, prompt
+            writer.write(cat_name, index, {**full_prompt, 'name': prompt['name'], 'category': cat_name})
+            if state is not None:
+                state.mark_done(full_prompt)
+            return None
+
+        results = await asyncio.gather(*(
+            fetch_and_write(cat_name, index, prompt) for cat_name, index, prompt in jobs
+        ))
+
+    return [pending for pending in results if pending is not None]
+
+def collect_http_contents(jobs, writer, state=None):
+    """Executa a extração de conteúdo HTTP quando o aiohttp está disponível
+
+    Retorna os prompts pendentes para o Selenium.
+    """
+    if not AIOHTTP_AVAILABLE:
+        logging.info("aiohttp não disponível - conteúdo será extraído com Selenium")
+        return list(jobs)
+
+    logging.info("Extraindo conteúdo dos prompts via HTTP (aiohttp)")
+    return asyncio.run(extract_contents_http(jobs, writer, state))
+
+# Caracteres descartados do nome do arquivo (mantém letras, dígitos, espaço, '-' e '_')
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]')
 
-        category_saved = 0
+def _write_text_file(filepath, content):
+    """Grava um arquivo de texto em UTF-8"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
 
-        for i, prompt in enumerate(cat_data['prompts'], 1):
-            # Nome do arquivo seguro
-            safe_name = "".join(c for c in prompt['name'][:50] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_name = safe_name.replace(" ", "_").lower()
-            if not safe_name:
-                safe_name = f"prompt_{i}"
+class PromptWriter:
+    """Grava cada prompt em disco assim que é extraído
 
-            filename = f"{i:03d}_{safe_name}.md"
-            filepath = os.path.join(cat_dir, filename)
+    Escreve o arquivo Markdown do prompt e uma linha em prompts.jsonl,
+    mantendo em memória apenas os contadores por categoria. Os arquivos
+    são gravados por um pool de threads; o índice README.md é gerado ao
+    sair do contexto, depois que todas as gravações terminam.
 
-            # Conteúdo do arquivo
-            content = f"""# {prompt['name']}
+    Com output_dir (execução retomada) os arquivos são acrescentados ao
+    diretório existente e o índice conta também os já gravados.
+    """
+
+    def __init__(self, base_dir="prompts_extraidos", categories=(), output_dir=None):
+        self._resumed = output_dir is not None
+        if output_dir is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = f"{timestamp}_{base_dir}"
+        self.output_dir = output_dir
+        self.total_saved = 0
+        self.categories_stats = {}
+        self._category_dirs = {}
+        self._hash_to_path = {}
+        self._categories = list(categories)
+        self._jsonl_file = None
+        self._executor = None
+        self._stats_lock = threading.Lock()
+
+    def __enter__(self):
+        # Criar diretórios
+        os.makedirs(self.output_dir, exist_ok=True)
+        for cat_name in self._categories:
+            self._category_dir(cat_name)
+
+        self._jsonl_file = open(os.path.join(self.output_dir, "prompts.jsonl"), 'ab')
+        self._executor = ThreadPoolExecutor(max_workers=WRITE_WORKERS)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Aguardar as gravações pendentes antes de gerar o índice
+        self._executor.shutdown(wait=True)
+        self._jsonl_file.close()
+
+        for cat_name, count in self.categories_stats.items():
+            logging.info(f"Categoria {cat_name}: {count} prompts salvos")
+
+        self._write_index()
+        logging.info(f"Prompts salvos no diretório: {self.output_dir}")
+        logging.info(f"Total de arquivos criados: {self.total_saved}")
+        return False
+
+    def _category_dir(self, cat_name):
+        """Subdiretório da categoria (criado na primeira utilização)
+
+        Retorna (caminho_completo, nome_relativo), calculados uma única vez.
+        """
+        paths = self._category_dirs.get(cat_name)
+        if paths is None:
+            rel_dir = cat_name.replace(" ", "_").lower()
+            cat_dir = os.path.join(self.output_dir, rel_dir)
+            os.makedirs(cat_dir, exist_ok=True)
+            paths = self._category_dirs[cat_name] = (cat_dir + os.sep, rel_dir + "/")
+            # Diretório retomado: arquivos de execuções anteriores entram na contagem
+            existing = sum(1 for name in os.listdir(cat_dir) if name.endswith(".md"))
+            self.categories_stats[cat_name] = existing
+            self.total_saved += existing
+        return paths
+
+    def write(self, cat_name, index, prompt):
+        """Grava um prompt como Markdown e acrescenta sua linha ao JSONL"""
+        cat_dir, rel_dir = self._category_dir(cat_name)
+
+        # Nome do arquivo seguro
+        safe_name = _UNSAFE_FILENAME_CHARS.sub('', prompt['name'][:50]).rstrip()
+        safe_name = safe_name.replace(" ", "_").lower()
+        if not safe_name:
+            safe_name = f"prompt_{index}"
+
+        filename = f"{index:03d}_{safe_name}.md"
+        filepath = cat_dir + filename
+
+        # Conteúdo repetido (mesmo hash) vira apenas uma referência ao primeiro arquivo
+        body = prompt.get('content', 'Conteúdo não disponível')
+        digest = prompt.get('content_hash')
+        if digest is not None:
+            original_path = self._hash_to_path.get(digest)
+            if original_path is None:
+                self._hash_to_path[digest] = rel_dir + filename
+            else:
+                body = f"Ver: {original_path}"
+
+        # Conteúdo do arquivo
+        content = f"""# {prompt['name']}
 
 **Categoria:** {cat_name}
 **URL:** {prompt['url']}
@@ -367,53 +1166,72 @@ def save_prompts_to_directory(all_data, base_dir="prompts_extraidos"):
 
 ---
 
-{prompt.get('content', 'Conteúdo não disponível')}
+{body}
 
 ---
 
 *Fonte: GodOfPrompt.ai*
 """
 
-            try:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                category_saved += 1
-                total_saved += 1
-            except Exception as e:
-                logging.error(f"Erro salvando {filepath}: {e}")
+        # Retomada: regravar um arquivo já contado (prompt que falhou antes) não soma de novo
+        is_new = not (self._resumed and os.path.exists(filepath))
 
-        categories_stats[cat_name] = category_saved
-        logging.info(f"Categoria {cat_name}: {category_saved} prompts salvos")
+        future = self._executor.submit(_write_text_file, filepath, content)
+        future.add_done_callback(partial(self._on_written, cat_name, filepath, is_new))
+        self._jsonl_file.write(json_bytes({**prompt, 'category': cat_name}) + b"\n")
 
-    # Criar arquivo de índice
-    index_content = f"""# Índice de Prompts Extraídos
+    def _on_written(self, cat_name, filepath, is_new, future):
+        """Atualiza os contadores quando a gravação de um arquivo termina"""
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Erro salvando {filepath}: {error}")
+            return
+        if not is_new:
+            return
+
+        with self._stats_lock:
+            self.categories_stats[cat_name] += 1
+            self.total_saved += 1
+
+    def _write_index(self):
+        """Cria o arquivo de índice README.md"""
+        index_content = f"""# Índice de Prompts Extraídos
 
 **Data de Extração:** {datetime.now().isoformat()}
-**Total de Prompts:** {total_saved}
-**Diretório:** {output_dir}
+**Total de Prompts:** {self.total_saved}
+**Diretório:** {self.output_dir}
 
 ## Estatísticas por Categoria
 
 """
 
-    for cat_name, count in categories_stats.items():
-        index_content += f"- **{cat_name}:** {count} prompts\n"
+        for cat_name, count in self.categories_stats.items():
+            index_content += f"- **{cat_name}:** {count} prompts\n"
 
-    index_content += "\n## Estrutura de Arquivos\n\n"
-    index_content += "Cada categoria tem seu próprio subdiretório com arquivos Markdown individuais.\n"
-    index_content += "Formato do arquivo: `NNN_nome_do_prompt.md`\n\n"
-    index_content += "---\n\n*Gerado automaticamente pelo GodOfPrompt Scraper*"
+        index_content += "\n## Estrutura de Arquivos\n\n"
+        index_content += "Cada categoria tem seu próprio subdiretório com arquivos Markdown individuais.\n"
+        index_content += "Formato do arquivo: `NNN_nome_do_prompt.md`\n\n"
+        index_content += "---\n\n*Gerado automaticamente pelo GodOfPrompt Scraper*"
 
-    index_path = os.path.join(output_dir, "README.md")
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(index_content)
+        index_path = os.path.join(self.output_dir, "README.md")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(index_content)
 
-    logging.info(f"Prompts salvos no diretório: {output_dir}")
-    logging.info(f"Total de arquivos criados: {total_saved}")
-    return output_dir
+def save_prompts_to_directory(all_data, base_dir="prompts_extraidos"):
+    """Salva cada prompt em um arquivo separado em diretório organizado"""
+    with PromptWriter(base_dir, all_data) as writer:
+        for cat_name, cat_data in all_data.items():
+            for i, prompt in enumerate(cat_data['prompts'], 1):
+                writer.write(cat_name, i, prompt)
 
-def main():
-    """Função principal para extrair todos os links"""
+    return writer.output_dir
+
+def main(resume=False):
+    """Função principal para extrair todos os links
+
+    resume=True (--resume) pula os prompts já extraídos pela execução
+    anterior e completa o diretório de saída dela.
+    """
     print("🚀 === EXTRATOR COMPLETO DE LINKS DO GODOFPROMPT.AI ===\n")
 
     # Configurar logging
@@ -439,41 +1257,40 @@ def main():
 
         # Resultados finais
         all_data = {}
+        prompt_counts = Counter()
 
-        # Criar driver único para reutilização
-        driver = create_driver()
+        # Listagens via HTTP primeiro; Selenium só para as que dependem de JS
+        http_listings = collect_http_listings(categories)
 
-        try:
-            # Processar cada categoria
-            for i, category in enumerate(categories, 1):
-                print(f"\n🔄 [{i}/{len(categories)}] Processando: {category['nome']}")
+        # Categorias renderizadas via JS vão para o pool de navegadores
+        selenium_categories = [cat for cat in categories if http_listings.get(cat['nome']) is None]
+        selenium_listings = extract_categories_selenium(selenium_categories)
 
-                # Extrair links da categoria
-                prompts = extract_category_links(category, driver, should_close_driver=False)
+        # Processar cada categoria
+        for i, category in enumerate(categories, 1):
+            print(f"\n🔄 [{i}/{len(categories)}] Processando: {category['nome']}")
 
-                # Armazenar resultados
-                all_data[category['nome']] = {
-                    'quantidade_esperada': category['quantidadeDePrompts'],
-                    'url_base': category['link'],
-                    'prompts': prompts
-                }
-
-                # Exibir estatísticas da categoria
-                print(f"✅ {category['nome']}: {len(prompts)}/{category['quantidadeDePrompts']} prompts extraídos")
+            # Links da categoria (HTTP ou Selenium)
+            prompts = http_listings.get(category['nome'])
+            if prompts is None:
+                prompts = selenium_listings[category['nome']]
 
-                # Pequena pausa entre categorias
-                time.sleep(2)
+            # Armazenar resultados
+            all_data[category['nome']] = {
+                'quantidade_esperada': category['quantidadeDePrompts'],
+                'url_base': category['link'],
+                'prompts': prompts
+            }
+            prompt_counts[category['nome']] = len(prompts)
 
-        finally:
-            # Fechar driver
-            if driver:
-                driver.quit()
+            # Exibir estatísticas da categoria
+            print(f"✅ {category['nome']}: {len(prompts)}/{category['quantidadeDePrompts']} prompts extraídos")
 
         # Salvar resultados
         print("\n💾 Salvando resultados...")
 
         # Salvar links em YAML (sempre)
-        yaml_file = save_links_to_yaml(all_data)
+        yaml_file = save_links_to_yaml(all_data, prompt_counts=prompt_counts)
 
         # Perguntar se quer extrair conteúdo completo dos prompts
         extrair_conteudo = input("\n🤔 Deseja extrair o conteúdo completo dos prompts? (s/n): ").lower().strip()
@@ -483,22 +1300,36 @@ def main():
             print("\n📝 Iniciando extração de conteúdo dos prompts...")
             print("⚠️  ATENÇÃO: Isso pode demorar muito tempo dependendo do número de prompts!")
 
-            # Criar driver para extração de conteúdo
-            content_driver = create_driver()
+            # Cada prompt vai para o disco assim que extraído (memória constante)
+            with ExtractionState(resume=resume) as state, \
+                    PromptWriter(categories=all_data, output_dir=state.output_dir) as writer:
+                state.set_output_dir(writer.output_dir)
 
-            try:
-                # Extrair conteúdo de todos os prompts
-                enriched_data = {}
+                # Pular prompts já extraídos pela execução retomada
+                jobs = content_jobs(all_data, state)
+                skipped = sum(prompt_counts.values()) - len(jobs)
+                if skipped:
+                    print(f"⏭️  {skipped} prompts já extraídos serão pulados; "
+                          f"completando {writer.output_dir}")
+
+                # Conteúdo via HTTP concorrente; Selenium só para o que falhar
+                pending = collect_http_contents(jobs, writer, state)
+
+                if pending:
+                    print(f"\n🔄 Extraindo {len(pending)} prompts com o navegador...")
 
-                for cat_name, cat_data in all_data.items():
-                    print(f"\n🔄 Processando conteúdo da categoria: {cat_name}")
-                    enriched_prompts = []
+                # Driver criado sob demanda para o fallback
+                content_driver = None
 
-                    for i, prompt in enumerate(cat_data['prompts'], 1):
+                try:
+                    for i, (cat_name, index, prompt) in enumerate(pending, 1):
                         if i % 10 == 0:  # Log a cada 10 prompts
-                            print(f"  📄 Processado {i}/{len(cat_data['prompts'])} prompts de {cat_name}")
+                            print(f"  📄 Processado {i}/{len(pending)} prompts")
 
                         try:
+                            if content_driver is None:
+                                content_driver = create_driver()
+
                             # Extrair conteúdo completo
                             full_prompt = extract_prompt_content(
                                 content_driver,
@@ -506,37 +1337,35 @@ def main():
                                 prompt['name'],
                                 cat_name
                             )
-                            enriched_prompts.append(full_prompt)
-
-                            # Pequena pausa para não sobrecarregar
-                            time.sleep(1)
 
                         except Exception as e:
                             logging.error(f"Erro no prompt {prompt['name']}: {e}")
                             # Manter dados originais se falhar
-                            enriched_prompts.append({
+                            full_prompt = {
                                 **prompt,
                                 'content': 'Erro na extração de conteúdo',
                                 'content_length': 0
-                            })
+                            }
 
-                    enriched_data[cat_name] = {
-                        **cat_data,
-                        'prompts': enriched_prompts
-                    }
+                        writer.write(cat_name, index, full_prompt)
+                        if full_prompt.get('content_length'):
+                            state.mark_done(full_prompt)
 
-                # Salvar prompts completos em diretório
-                prompts_dir = save_prompts_to_directory(enriched_data)
-                print(f"\n✅ Prompts completos salvos em: {prompts_dir}")
+                finally:
+                    if content_driver:
+                        content_driver.quit()
 
-            finally:
-                content_driver.quit()
+            for cat_name, count in writer.categories_stats.items():
+                print(f"  ✅ {cat_name}: {count} prompts salvos")
+
+            prompts_dir = writer.output_dir
+            print(f"\n✅ Prompts completos salvos em: {prompts_dir}")
 
         # Salvar resultados completos em JSON (sempre)
-        json_file = save_results(all_data)
+        json_file = save_results(all_data, prompt_counts=prompt_counts)
 
         # Exibir estatísticas finais
-        total_prompts = sum(len(cat_data['prompts']) for cat_data in all_data.values())
+        total_prompts = sum(prompt_counts.values())
         total_esperado = sum(cat['quantidadeDePrompts'] for cat in categories)
 
         print("\n🎉 === EXTRAÇÃO CONCLUÍDA ===")
@@ -550,8 +1379,9 @@ def main():
         print("\n📈 Detalhes por categoria:")
 
         for cat_name, cat_data in all_data.items():
-            porcentagem = (len(cat_data['prompts']) / cat_data['quantidade_esperada']) * 100
-            print(f"  {cat_name}: {len(cat_data['prompts'])}/{cat_data['quantidade_esperada']} ({porcentagem:.1f}%)")
+            extraidos = prompt_counts[cat_name]
+            porcentagem = (extraidos / cat_data['quantidade_esperada']) * 100
+            print(f"  {cat_name}: {extraidos}/{cat_data['quantidade_esperada']} ({porcentagem:.1f}%)")
 
         logging.info("Extração completa finalizada com sucesso")
 
@@ -594,8 +1424,10 @@ def test_category(category_name=None):
     print(f"\n🔍 Testando categoria: {category['nome']}")
     print(f"📊 Esperado: {category['quantidadeDePrompts']} prompts")
 
-    # Testar extração
-    prompts = extract_category_links(category)
+    # Testar extração (HTTP primeiro, Selenium como fallback)
+    prompts = collect_http_listings([category]).get(category['nome'])
+    if prompts is None:
+        prompts = extract_category_links(category)
 
     print("\n✅ Teste concluído:")
     print(f"📊 Prompts extraídos: {len(prompts)}")
@@ -654,7 +1486,6 @@ def test_category(category_name=None):
                         category['nome']
                     )
                     enriched_prompts.append(full_prompt)
-                    time.sleep(1)
 
                 enriched_test_data[category['nome']] = {
                     'quantidade_esperada': category['quantidadeDePrompts'],
@@ -677,5 +1508,5 @@ if __name__ == "__main__":
         category_name = sys.argv[2] if len(sys.argv) > 2 else None
         test_category(category_name)
     else:
-        # Modo completo
-        main()
+        # Modo completo (--resume: completar a execução anterior)
+        main(resume="--resume" in sys.argv[1:])
@@ -8,10 +8,17 @@ import time
 import json
 import logging
 import os
+import sys
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
+from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 
 try:
@@ -21,39 +28,341 @@ except ImportError:
     FIRECRAWL_AVAILABLE = False
     logging.warning("FireCrawl não está instalado. Use: pip install firecrawl-py")
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# API REST do FireCrawl (usada diretamente no modo assíncrono)
+FIRECRAWL_API_URL = "https://api.firecrawl.dev"
+
+# Pool de conexões HTTP reaproveitado entre requisições (keep-alive)
+HTTP_POOL_SIZE = 50
+# Só os GETs (consulta de jobs) são repetidos após leitura/status de erro: um POST
+# repetido cria outro job ou scrape cobrado. Falhas de conexão (requisição não
+# enviada) são repetidas para qualquer método.
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['GET']),
+    # 429 com Retry-After: esperar o que o FireCrawl pedir em vez de um backoff fixo
+    respect_retry_after_header=True
+)
+
+# Actions executadas pelo FireCrawl em cada página (o carregamento inicial
+# é coberto por waitFor)
+_DEFAULT_ACTIONS = (
+    # Simular scroll para carregar conteúdo lazy-loaded
+    {'type': 'scroll', 'direction': 'down'},
+    {'type': 'wait', 'milliseconds': 1000},
+)
+
+# Tentar fechar modals/popups (FireCrawlConfig.enable_modal_dismiss)
+_MODAL_DISMISS_ACTIONS = (
+    {'type': 'click', 'selector': 'button[aria-label="Close"]', 'optional': True},
+    {'type': 'click', 'selector': '.modal-close', 'optional': True},
+)
+
+# Polling dos jobs de /v1/batch/scrape (backoff exponencial)
+BATCH_POLL_INITIAL_DELAY = 1.0
+BATCH_POLL_MAX_DELAY = 30.0
+BATCH_POLL_TIMEOUT = 600
+
+# Requisições simultâneas no modo assíncrono (também o limite por host)
+ASYNC_CONCURRENCY = 64
+
+# Threads do HybridScraper.scrape_urls
+HYBRID_WORKERS = 16
 
-@dataclass
+# HybridScraper: timeout do FireCrawl (ms) e circuit breaker - após N falhas
+# seguidas, usar só o método tradicional por alguns segundos
+HYBRID_FIRECRAWL_TIMEOUT = 10000
+FIRECRAWL_FAILURE_THRESHOLD = 5
+FIRECRAWL_COOLDOWN_SECONDS = 60
+
+# Cache em disco dos resultados de scraping
+CACHE_DB_PATH = "firecrawl_cache.db"
+CACHE_TTL_SUCCESS = 7 * 24 * 3600  # 7 dias
+CACHE_TTL_FAILURE = 3600  # 1 hora: erros transitórios voltam a ser tentados logo
+
+# Cache negativo: URLs com falhas definitivas (4xx) repetidas são puladas
+NEGATIVE_CACHE_MAX_FAILURES = 3
+NEGATIVE_CACHE_WINDOW = 24 * 3600
+
+# 4xx que indicam erro transitório (timeout, rate limit), não falha definitiva
+TRANSIENT_CLIENT_ERRORS = frozenset([408, 429])
+
+# dataclass(slots=True) só existe a partir do Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class FireCrawlConfig:
-    """Configuração para FireCrawl"""
+    """Configuração para FireCrawl (imutável e hashable)"""
     
     # API Key (deve ser configurada via variável de ambiente)
     api_key: str = ""
     
     # Configurações de scraping
-    formats: List[str] = field(default_factory=lambda: ["markdown", "html"])
+    formats: Tuple[str, ...] = ("markdown", "html")
     only_main_content: bool = True
-    include_tags: List[str] = field(default_factory=lambda: ["h1", "h2", "h3", "p", "pre", "code", "div"])
-    exclude_tags: List[str] = field(default_factory=lambda: ["script", "style", "nav", "footer", "header"])
+    include_tags: Tuple[str, ...] = ("h1", "h2", "h3", "p", "pre", "code", "div")
+    exclude_tags: Tuple[str, ...] = ("script", "style", "nav", "footer", "header")
     
     # Configurações de crawler
-    wait_for: int = 3000  # ms
+    wait_for: int = 4000  # ms (inclui a espera que antes era uma action)
     timeout: int = 30000  # ms
     
     # Rate limiting
     max_requests_per_minute: int = 60
     
+    # Cliques para fechar modals/popups (raramente presentes, mas cobrados)
+    enable_modal_dismiss: bool = False
+    
+    # Memória: limite opcional do HTML guardado com only_main_content
+    # (caracteres; None = sem corte) e resposta bruta mantida no resultado
+    # apenas em modo debug
+    max_html_chars: Optional[int] = None
+    debug: bool = False
+    
     def __post_init__(self):
+        # Instância congelada: ajustes só via object.__setattr__
+        for name in ('formats', 'include_tags', 'exclude_tags'):
+            object.__setattr__(self, name, tuple(getattr(self, name)))
+        
         if not self.api_key:
-            self.api_key = os.getenv('FIRECRAWL_API_KEY', '')
+            object.__setattr__(self, 'api_key', os.getenv('FIRECRAWL_API_KEY', ''))
         
         if not self.api_key:
             logging.warning("FIRECRAWL_API_KEY não configurada")
 
 
+def format_scraped_at(ts: int) -> str:
+    """Formata o timestamp scraped_at_ts (epoch) como 'AAAA-MM-DD HH:MM:SS'"""
+    return datetime.fromtimestamp(ts).isoformat(sep=' ', timespec='seconds')
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ScrapeResult:
+    """Resultado padronizado de scraping (FireCrawl ou método tradicional)"""
+    success: bool
+    url: str
+    markdown: str = ""
+    html: str = ""
+    text: str = ""
+    title: str = ""
+    description: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    raw_result: Optional[Dict[str, Any]] = None  # Apenas em modo debug
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato em dicionário (content/metadata) usado antes desta classe"""
+        result = {
+            'success': self.success,
+            'url': self.url,
+            'content': {
+                'markdown': self.markdown,
+                'html': self.html,
+                'text': self.text,
+                'title': self.title,
+                'description': self.description,
+            },
+            'metadata': self.metadata,
+            'error': self.error
+        }
+        if self.raw_result is not None:
+            result['raw_result'] = self.raw_result
+        return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScrapeResult':
+        content = data.get('content') or {}
+        return cls(
+            success=data['success'],
+            url=data['url'],
+            markdown=content.get('markdown', ''),
+            html=content.get('html', ''),
+            text=content.get('text', ''),
+            title=content.get('title', ''),
+            description=content.get('description', ''),
+            metadata=data.get('metadata') or {},
+            error=data.get('error'),
+            raw_result=data.get('raw_result')
+        )
+    
+    @classmethod
+    def failure(cls, url: str, error: str, status_code: Optional[int] = None,
+                api_status_code: Optional[int] = None) -> 'ScrapeResult':
+        """status_code é o da página alvo; api_status_code, o da API do FireCrawl"""
+        metadata = {}
+        if status_code:
+            metadata['status_code'] = status_code
+        if api_status_code:
+            metadata['api_status_code'] = api_status_code
+        return cls(success=False, url=url, error=error, metadata=metadata)
+    
+    @property
+    def is_permanent_failure(self) -> bool:
+        """Falha definitiva da página (4xx não transitório), que não adianta repetir logo
+        
+        Só o status da página alvo conta: erros da API (chave inválida, sem
+        créditos, requisição rejeitada) não dizem nada sobre a URL.
+        """
+        status_code = self.metadata.get('status_code') or 0
+        return (not self.success and 400 <= status_code < 500
+                and status_code not in TRANSIENT_CLIENT_ERRORS)
+    
+    def __bytes__(self) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8')
+
+
+class TokenBucket:
+    """Token bucket: até `rate` requisições por segundo, com rajadas de até `capacity`
+
+    Só espera quando o balde está vazio - respostas rápidas não pagam pausa fixa.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._sync_lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+    
+    def acquire_blocking(self) -> float:
+        """Bloqueia a thread até haver um token disponível; retorna o tempo esperado
+        
+        Seguro entre threads: quem espera segura o lock, e as demais aguardam na fila.
+        """
+        with self._sync_lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            
+            wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+            self._refill()
+            self._tokens -= 1
+            return wait
+    
+    async def acquire(self):
+        """Aguarda (sem bloquear o event loop) até haver um token disponível"""
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class ScrapeCache:
+    """Cache em SQLite dos resultados processados, indexado pela URL
+
+    Cada entrada guarda o dicionário retornado pelo scraper e expira após
+    seu TTL (longo para sucessos, curto para falhas). Falhas definitivas
+    também são contadas na tabela failures (cache negativo).
+    """
+    
+    def __init__(self, db_path: str = CACHE_DB_PATH,
+                 ttl_success: int = CACHE_TTL_SUCCESS,
+                 ttl_failure: int = CACHE_TTL_FAILURE):
+        self.ttl_success = ttl_success
+        self.ttl_failure = ttl_failure
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages "
+            "(url TEXT PRIMARY KEY, scraped_at REAL, ttl REAL, payload BLOB)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS failures "
+            "(url TEXT PRIMARY KEY, last_error TEXT, fail_count INTEGER, first_failed_at REAL)"
+        )
+    
+    @staticmethod
+    def _loads(payload: bytes) -> ScrapeResult:
+        data = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+        return ScrapeResult.from_dict(data)
+    
+    def get(self, url: str) -> Optional[ScrapeResult]:
+        """Retorna o resultado em cache para a URL, se ainda válido"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT scraped_at, ttl, payload FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        scraped_at, ttl, payload = row
+        if time.time() - scraped_at >= ttl:
+            return None
+        
+        return self._loads(payload)
+    
+    def set(self, url: str, result: ScrapeResult):
+        """Armazena o resultado com TTL conforme sucesso ou falha"""
+        ttl = self.ttl_success if result.success else self.ttl_failure
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, scraped_at, ttl, payload) VALUES (?, ?, ?, ?)",
+                (url, time.time(), ttl, bytes(result))
+            )
+            if result.success:
+                self.conn.execute("DELETE FROM failures WHERE url = ?", (url,))
+            elif result.is_permanent_failure:
+                self._record_failure(url, result.error)
+            self.conn.commit()
+    
+    def _record_failure(self, url: str, error: Optional[str]):
+        # Falhas fora da janela recomeçam a contagem
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO failures (url, last_error, fail_count, first_failed_at) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT(url) DO UPDATE SET last_error = excluded.last_error, "
+            "fail_count = CASE WHEN ? - first_failed_at < ? THEN fail_count + 1 ELSE 1 END, "
+            "first_failed_at = CASE WHEN ? - first_failed_at < ? THEN first_failed_at ELSE ? END",
+            (url, error, now, now, NEGATIVE_CACHE_WINDOW, now, NEGATIVE_CACHE_WINDOW, now)
+        )
+    
+    def permanent_failures(self) -> Dict[str, str]:
+        """URLs com falhas definitivas recentes repetidas: {url: último erro}"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT url, last_error FROM failures WHERE fail_count >= ? AND ? - first_failed_at < ?",
+                (NEGATIVE_CACHE_MAX_FAILURES, time.time(), NEGATIVE_CACHE_WINDOW)
+            ).fetchall()
+        return dict(rows)
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
 class FireCrawlScraper:
     """Scraper usando FireCrawl para bypass avançado de anti-bot"""
     
-    def __init__(self, config: FireCrawlConfig = None):
+    def __init__(self, config: FireCrawlConfig = None, cache: ScrapeCache = None):
         if not FIRECRAWL_AVAILABLE:
             raise ImportError("FireCrawl não está disponível. Instale com: pip install firecrawl-py")
         
@@ -65,128 +374,349 @@ class FireCrawlScraper:
         # Inicializar cliente FireCrawl
         self.app = FirecrawlApp(api_key=self.config.api_key)
         
+        # Sessão HTTP única para a API REST: evita handshake TCP/TLS por requisição
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = f"Bearer {self.config.api_key}"
+        self.session.mount("https://", HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                                                   pool_maxsize=HTTP_POOL_SIZE,
+                                                   max_retries=HTTP_RETRY))
+        
+        # Opções de scraping fixas (copiadas só quando há customização)
+        self._base_scrape_options = self._make_base_scrape_options()
+        
+        # Cache em disco (opcional) dos resultados por URL
+        self.cache = cache
+        
         # Controle de rate limiting
-        self.request_times = []
-        self.last_request_time = 0
+        self._bucket = TokenBucket(self.config.max_requests_per_minute / 60,
+                                   self.config.max_requests_per_minute)
         
         # Estatísticas
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cache_hits': 0,
             'total_cost': 0.0  # FireCrawl é pago
         }
+        # scrape_single_url pode rodar em várias threads (HybridScraper.scrape_urls)
+        self._stats_lock = threading.Lock()
+    
+    def _record_request(self, success: bool):
+        """Contabiliza uma requisição ao FireCrawl (seguro entre threads)"""
+        with self._stats_lock:
+            self.stats['total_requests'] += 1
+            if success:
+                self.stats['successful_requests'] += 1
+                # Estimar custo (FireCrawl cobra por requisição)
+                self.stats['total_cost'] += 0.001  # Estimativa
+            else:
+                self.stats['failed_requests'] += 1
+    
+    def _record_cache_hits(self, count: int = 1):
+        with self._stats_lock:
+            self.stats['cache_hits'] += count
     
-    def scrape_single_url(self, url: str, custom_options: Dict = None) -> Dict[str, Any]:
+    def scrape_single_url(self, url: str, custom_options: Dict = None,
+                          force_rescrape: bool = False) -> ScrapeResult:
         """Scraping de uma única URL com FireCrawl"""
         
+        # Resultado recente em cache dispensa a requisição
+        if self.cache and not force_rescrape:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self._record_cache_hits()
+                logging.info(f"Cache hit: {url}")
+                return cached
+        
         # Rate limiting
         self._enforce_rate_limit()
         
-        # Opções de scraping
-        scrape_options = {
-            'formats': self.config.formats,
-            'onlyMainContent': self.config.only_main_content,
-            'includeTags': self.config.include_tags,
-            'excludeTags': self.config.exclude_tags,
-            'waitFor': self.config.wait_for,
-            'timeout': self.config.timeout,
-            'actions': [
-                # Aguardar carregamento completo
-                {'type': 'wait', 'milliseconds': 2000},
-                
-                # Simular scroll para carregar conteúdo lazy-loaded
-                {'type': 'scroll', 'direction': 'down'},
-                {'type': 'wait', 'milliseconds': 1000},
-                
-                # Tentar fechar modals/popups
-                {'type': 'click', 'selector': 'button[aria-label="Close"]', 'optional': True},
-                {'type': 'click', 'selector': '.modal-close', 'optional': True},
-            ]
-        }
-        
-        # Sobrescrever com opções customizadas
-        if custom_options:
-            scrape_options.update(custom_options)
+        scrape_options = self._build_scrape_options(custom_options)
         
         try:
             logging.info(f"Fazendo scraping com FireCrawl: {url}")
             
             # Executar scraping
-            result = self.app.scrape_url(url, scrape_options)
+            result = self._post_scrape(url, scrape_options)
             
             # Atualizar estatísticas
-            self.stats['total_requests'] += 1
-            self.stats['successful_requests'] += 1
-            
-            # Estimar custo (FireCrawl cobra por requisição)
-            self.stats['total_cost'] += 0.001  # Estimativa
+            self._record_request(True)
             
             # Processar resultado
             processed_result = self._process_firecrawl_result(result, url)
             
             logging.info(f"✅ Scraping bem-sucedido: {url}")
-            return processed_result
             
         except Exception as e:
-            self.stats['total_requests'] += 1
-            self.stats['failed_requests'] += 1
+            self._record_request(False)
             
             logging.error(f"❌ Erro no FireCrawl para {url}: {e}")
             
-            return {
-                'success': False,
-                'url': url,
-                'error': str(e),
-                'content': {},
-                'metadata': {}
-            }
+            response = getattr(e, 'response', None)
+            api_status_code = response.status_code if response is not None else None
+            processed_result = ScrapeResult.failure(url, str(e), api_status_code=api_status_code)
+        
+        if self.cache:
+            self.cache.set(url, processed_result)
+        
+        return processed_result
+    
+    def _post_scrape(self, url: str, scrape_options: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /v1/scrape pela sessão compartilhada (o SDK não aceita sessão externa)"""
+        payload = dict(scrape_options, url=url)
+        
+        # Leitura um pouco além do timeout do FireCrawl para receber o erro dele
+        read_timeout = scrape_options.get('timeout', self.config.timeout) / 1000 + 5
+        response = self.session.post(f"{FIRECRAWL_API_URL}/v1/scrape", json=payload,
+                                     timeout=(5, read_timeout))
+        response.raise_for_status()
+        return response.json()
+    
+    def _make_base_scrape_options(self) -> Dict[str, Any]:
+        """Opções de scraping fixas, montadas uma única vez no __init__"""
+        return {
+            'formats': self.config.formats,
+            'onlyMainContent': self.config.only_main_content,
+            'includeTags': self.config.include_tags,
+            'excludeTags': self.config.exclude_tags,
+            'waitFor': self.config.wait_for,
+            'timeout': self.config.timeout,
+            'actions': _DEFAULT_ACTIONS + (_MODAL_DISMISS_ACTIONS if self.config.enable_modal_dismiss else ())
+        }
+    
+    def _build_scrape_options(self, custom_options: Dict = None) -> Dict[str, Any]:
+        """Opções de scraping do FireCrawl (template + customizações)
+        
+        Sem customizações retorna o próprio template compartilhado, que não
+        deve ser modificado.
+        """
+        if not custom_options:
+            return self._base_scrape_options
+        return {**self._base_scrape_options, **custom_options}
     
     def scrape_multiple_urls(self, urls: List[str], 
                            custom_options: Dict = None,
-                           batch_size: int = 10) -> List[Dict[str, Any]]:
-        """Scraping de múltiplas URLs com controle de lote"""
+                           batch_size: int = 10) -> List[ScrapeResult]:
+        """Scraping de múltiplas URLs com controle de lote
+        
+        Cada lote vira um único job em /v1/batch/scrape; se o job falhar, as
+        URLs do lote são processadas individualmente.
+        """
         
         logging.info(f"Iniciando scraping de {len(urls)} URLs com FireCrawl")
         
-        results = []
+        # Remover duplicatas preservando a ordem (cada URL é cobrada uma única vez)
+        unique_urls = list(dict.fromkeys(urls))
+        duplicates = len(urls) - len(unique_urls)
+        if duplicates:
+            logging.info(f"{duplicates} URLs duplicadas ignoradas")
+        
+        results_by_url = {}
+        
+        # Resultados em cache não entram nos lotes
+        if self.cache:
+            for url in unique_urls:
+                cached = self.cache.get(url)
+                if cached is not None:
+                    results_by_url[url] = cached
+            self._record_cache_hits(len(results_by_url))
+        
+        # Pular URLs com falhas definitivas recentes (404, bloqueio...)
+        if self.cache:
+            known_failures = self.cache.permanent_failures()
+            skipped = 0
+            for url in unique_urls:
+                if url not in results_by_url and url in known_failures:
+                    results_by_url[url] = ScrapeResult.failure(url, known_failures[url])
+                    skipped += 1
+            if skipped:
+                logging.info(f"{skipped} URLs com falha permanente ignoradas")
+        
+        pending = [url for url in unique_urls if url not in results_by_url]
         
         # Processar em lotes para controlar custos e rate limits
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i + batch_size]
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
             batch_num = i // batch_size + 1
-            total_batches = (len(urls) - 1) // batch_size + 1
+            total_batches = (len(pending) - 1) // batch_size + 1
             
             logging.info(f"Processando lote {batch_num}/{total_batches} - {len(batch)} URLs")
             
-            # Processar cada URL do lote
-            for url in batch:
-                result = self.scrape_single_url(url, custom_options)
-                results.append(result)
-                
-                # Pequena pausa entre URLs
-                time.sleep(1)
+            try:
+                results_by_url.update(self._scrape_batch(batch, custom_options))
+            except (requests.RequestException, RuntimeError, TimeoutError, KeyError, ValueError) as e:
+                logging.warning(f"Batch do FireCrawl falhou ({e}), processando URLs individualmente")
+                for url in batch:
+                    results_by_url[url] = self.scrape_single_url(url, custom_options, force_rescrape=True)
             
-            # Pausa maior entre lotes
-            if i + batch_size < len(urls):
-                logging.info(f"Pausando entre lotes... (Custo estimado: ${self.stats['total_cost']:.3f})")
-                time.sleep(5)
+            logging.info(f"Lote {batch_num}/{total_batches} concluído (Custo estimado: ${self.stats['total_cost']:.3f})")
+        
+        # Um resultado por URL de entrada, na ordem original
+        results = [results_by_url[url] for url in urls]
         
-        logging.info(f"Scraping completo: {len(results)} URLs processadas")
+        logging.info(f"Scraping completo: {len(results_by_url)} URLs processadas")
         self._log_statistics()
         
         return results
     
+    def _scrape_batch(self, batch: List[str], custom_options: Dict = None) -> Dict[str, ScrapeResult]:
+        """Submete um lote a /v1/batch/scrape e retorna {url: resultado processado}"""
+        
+        self._enforce_rate_limit()
+        
+        payload = dict(self._build_scrape_options(custom_options), urls=batch)
+        response = self.session.post(f"{FIRECRAWL_API_URL}/v1/batch/scrape", json=payload,
+                                     timeout=(5, 30))
+        response.raise_for_status()
+        job_id = response.json()['id']
+        
+        pages = self._wait_for_batch(job_id)
+        
+        # Associar cada página à URL solicitada (sourceURL, sem barra final)
+        pages_by_url = {}
+        for page in pages:
+            source_url = page.get('metadata', {}).get('sourceURL', '')
+            pages_by_url[source_url.rstrip('/')] = page
+        
+        results = {}
+        for url in batch:
+            page = pages_by_url.get(url.rstrip('/'))
+            
+            self._record_request(page is not None)
+            if page is not None:
+                result = self._process_firecrawl_result({'success': True, 'data': page}, url)
+            else:
+                logging.error(f"❌ URL ausente no resultado do batch: {url}")
+                result = ScrapeResult.failure(url, 'URL ausente no resultado do batch')
+            
+            if self.cache:
+                self.cache.set(url, result)
+            results[url] = result
+        
+        return results
+    
+    def _wait_for_batch(self, job_id: str) -> List[Dict[str, Any]]:
+        """Aguarda o job de batch com backoff exponencial e retorna todas as páginas"""
+        
+        status_url = f"{FIRECRAWL_API_URL}/v1/batch/scrape/{job_id}"
+        deadline = time.monotonic() + BATCH_POLL_TIMEOUT
+        delay = BATCH_POLL_INITIAL_DELAY
+        
+        while True:
+            response = self.session.get(status_url, timeout=(5, 30))
+            response.raise_for_status()
+            status = response.json()
+            
+            if status.get('status') == 'completed':
+                break
+            if status.get('status') == 'failed':
+                raise RuntimeError(f"job {job_id} falhou")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"job {job_id} não concluiu em {BATCH_POLL_TIMEOUT}s")
+            
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+        
+        # Resultados grandes vêm paginados via 'next'
+        pages = status.get('data', [])
+        next_url = status.get('next')
+        while next_url:
+            response = self.session.get(next_url, timeout=(5, 30))
+            response.raise_for_status()
+            status = response.json()
+            pages.extend(status.get('data', []))
+            next_url = status.get('next')
+        
+        return pages
+    
+    async def scrape_multiple_urls_async(self, urls: List[str],
+                                         custom_options: Dict = None,
+                                         concurrency: int = ASYNC_CONCURRENCY) -> List[ScrapeResult]:
+        """Scraping concorrente via API REST do FireCrawl (aiohttp)
+        
+        Até `concurrency` requisições simultâneas, ritmadas pelo token bucket
+        de max_requests_per_minute em vez de pausas fixas.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp não está disponível. Instale com: pip install aiohttp")
+        
+        unique_urls = list(dict.fromkeys(urls))
+        logging.info(f"Iniciando scraping assíncrono de {len(unique_urls)} URLs com FireCrawl")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+        # Sem timeout total: a espera por uma conexão livre no pool não conta como falha
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=15,
+                                        sock_read=self.config.timeout / 1000 + 15)
+        headers = {'Authorization': f"Bearer {self.config.api_key}"}
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=headers) as session:
+            scraped = await asyncio.gather(*(
+                self._scrape_url_async(session, semaphore, url, custom_options)
+                for url in unique_urls
+            ))
+        
+        results_by_url = dict(zip(unique_urls, scraped))
+        results = [results_by_url[url] for url in urls]
+        
+        logging.info(f"Scraping assíncrono completo: {len(results_by_url)} URLs processadas")
+        self._log_statistics()
+        
+        return results
+    
+    async def _scrape_url_async(self, session, semaphore: asyncio.Semaphore,
+                                url: str, custom_options: Dict = None) -> ScrapeResult:
+        """POST /v1/scrape para uma URL, com o mesmo formato de scrape_single_url"""
+        
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self._record_cache_hits()
+                return cached
+        
+        payload = dict(self._build_scrape_options(custom_options), url=url)
+        
+        async with semaphore:
+            await self._bucket.acquire()
+            try:
+                async with session.post(f"{FIRECRAWL_API_URL}/v1/scrape", json=payload) as response:
+                    result = await response.json(content_type=None)
+                    # Corpo vazio (ex.: 502 de um proxy) vira None
+                    if not isinstance(result, dict):
+                        result = {'success': False, 'error': f"Resposta inválida (HTTP {response.status})"}
+                    if response.status >= 400:
+                        result = {
+                            'success': False,
+                            'error': result.get('error', f"HTTP {response.status}"),
+                            'apiStatusCode': response.status
+                        }
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                result = {'success': False, 'error': str(e) or type(e).__name__}
+        
+        self._record_request(bool(result.get('success')))
+        if not result.get('success'):
+            logging.error(f"❌ Erro no FireCrawl para {url}: {result.get('error')}")
+        
+        processed_result = self._process_firecrawl_result(result, url)
+        
+        if self.cache:
+            self.cache.set(url, processed_result)
+        
+        return processed_result
+    
     def scrape_with_crawl_mode(self, base_url: str, max_pages: int = 50) -> Dict[str, Any]:
         """Usa modo crawl do FireCrawl para descobrir e scraping automático"""
         
         crawl_options = {
             'limit': max_pages,
+            # O SDK espera listas
             'scrapeOptions': {
-                'formats': self.config.formats,
+                'formats': list(self.config.formats),
                 'onlyMainContent': self.config.only_main_content,
-                'includeTags': self.config.include_tags,
-                'excludeTags': self.config.exclude_tags
+                'includeTags': list(self.config.include_tags),
+                'excludeTags': list(self.config.exclude_tags)
             },
             'crawlerOptions': {
                 'includes': [
@@ -234,79 +764,141 @@ class FireCrawlScraper:
                 'base_url': base_url
             }
     
-    def _process_firecrawl_result(self, result: Dict, url: str) -> Dict[str, Any]:
+    def iter_crawl_pages(self, base_url: str, max_pages: int = 50) -> Iterator[Dict[str, Any]]:
+        """Gera as páginas do crawl à medida que ficam prontas
+        
+        Inicia o job em /v1/crawl e consome /v1/crawl/{id}?skip=N; a próxima
+        página de resultados é buscada em segundo plano enquanto o chamador
+        processa a atual, e só uma página fica em memória por vez.
+        """
+        
+        self._enforce_rate_limit()
+        
+        payload = {
+            'url': base_url,
+            'limit': max_pages,
+            'includePaths': ['prompts?/.*'],
+            'excludePaths': ['auth/.*', 'login.*', 'signup.*'],
+            'scrapeOptions': {
+                'formats': self.config.formats,
+                'onlyMainContent': self.config.only_main_content,
+                'includeTags': self.config.include_tags,
+                'excludeTags': self.config.exclude_tags
+            }
+        }
+        response = self.session.post(f"{FIRECRAWL_API_URL}/v1/crawl", json=payload, timeout=(5, 30))
+        response.raise_for_status()
+        job_id = response.json()['id']
+        
+        logging.info(f"Crawl do FireCrawl iniciado: {base_url} (job {job_id})")
+        
+        status_url = f"{FIRECRAWL_API_URL}/v1/crawl/{job_id}"
+        
+        def fetch(offset):
+            response = self.session.get(status_url, params={'skip': offset}, timeout=(5, 30))
+            response.raise_for_status()
+            return response.json()
+        
+        offset = 0
+        delay = BATCH_POLL_INITIAL_DELAY
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(fetch, offset)
+            
+            while True:
+                status = pending.result()
+                pages = status.get('data', [])
+                offset += len(pages)
+                
+                finished = status.get('status') in ('completed', 'failed', 'cancelled')
+                if finished and not pages:
+                    break
+                
+                if pages:
+                    delay = BATCH_POLL_INITIAL_DELAY
+                    # Look-ahead: buscar a próxima página enquanto estas são consumidas
+                    pending = prefetcher.submit(fetch, offset)
+                    yield from pages
+                else:
+                    # Nada novo ainda: aguardar com backoff exponencial
+                    time.sleep(delay)
+                    delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+                    pending = prefetcher.submit(fetch, offset)
+        
+        if status.get('status') != 'completed':
+            logging.warning(f"Crawl {job_id} terminou com status {status.get('status')}")
+        
+        logging.info(f"Crawl concluído: {offset} páginas")
+    
+    def _process_firecrawl_result(self, result: Dict, url: str) -> ScrapeResult:
         """Processa resultado do FireCrawl para formato padronizado"""
         
         if not result.get('success', False):
-            return {
-                'success': False,
-                'url': url,
-                'error': result.get('error', 'Scraping falhou'),
-                'content': {},
-                'metadata': {}
-            }
+            return ScrapeResult.failure(url, result.get('error', 'Scraping falhou'),
+                                        api_status_code=result.get('apiStatusCode'))
         
         data = result.get('data', {})
         
+        # A API responde success mesmo quando a página alvo retorna erro
+        page_status = (data.get('metadata') or {}).get('statusCode') or 0
+        if page_status >= 400:
+            return ScrapeResult.failure(url, f"Página retornou HTTP {page_status}", page_status)
+        
         # Extrair conteúdos
-        content = {
-            'markdown': data.get('markdown', ''),
-            'html': data.get('html', ''),
-            'text': data.get('content', ''),  # Texto limpo
-            'title': data.get('metadata', {}).get('title', ''),
-            'description': data.get('metadata', {}).get('description', ''),
-        }
+        html = data.get('html', '')
+        html_truncated = (self.config.only_main_content and self.config.max_html_chars is not None
+                          and len(html) > self.config.max_html_chars)
+        if html_truncated:
+            html = html[:self.config.max_html_chars]
         
         # Metadados
         metadata = data.get('metadata', {})
+        if html_truncated:
+            # HTML cortado no meio: consumidores devem preferir o markdown
+            metadata['html_truncated'] = True
+        title = metadata.get('title', '')
+        description = metadata.get('description', '')
         metadata.update({
             'url': url,
-            'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'scraped_at_ts': int(time.time()),  # Formatar com format_scraped_at
             'scraping_method': 'firecrawl',
             'response_time': result.get('responseTime', 0),
             'status_code': metadata.get('statusCode', 0)
         })
         
-        return {
-            'success': True,
-            'url': url,
-            'content': content,
-            'metadata': metadata,
-            'raw_result': data  # Para debugging
-        }
+        return ScrapeResult(
+            success=True,
+            url=url,
+            markdown=data.get('markdown', ''),
+            html=html,
+            text=data.get('content', ''),  # Texto limpo
+            title=title,
+            description=description,
+            metadata=metadata,
+            # A resposta bruta duplica markdown/html: só mantê-la para debugging
+            raw_result=data if self.config.debug else None
+        )
     
     def _enforce_rate_limit(self):
-        """Controla rate limiting"""
-        current_time = time.time()
-        
-        # Limpar requisições antigas (mais de 1 minuto)
-        self.request_times = [t for t in self.request_times 
-                             if current_time - t < 60]
-        
-        # Verificar se excedeu limite
-        if len(self.request_times) >= self.config.max_requests_per_minute:
-            sleep_time = 60 - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                logging.info(f"Rate limit atingido, aguardando {sleep_time:.1f}s")
-                time.sleep(sleep_time)
-        
-        # Registrar requisição
-        self.request_times.append(current_time)
-        self.last_request_time = current_time
+        """Controla rate limiting (token bucket de max_requests_per_minute)"""
+        waited = self._bucket.acquire_blocking()
+        if waited:
+            logging.info(f"Rate limit atingido, aguardou {waited:.1f}s")
     
     def _log_statistics(self):
-        """Log das estatísticas de uso"""
-        success_rate = (self.stats['successful_requests'] / 
-                       max(self.stats['total_requests'], 1)) * 100
-        
-        logging.info(f"""
-        📊 Estatísticas FireCrawl:
-        • Total de requisições: {self.stats['total_requests']}
-        • Sucessos: {self.stats['successful_requests']}
-        • Falhas: {self.stats['failed_requests']}
-        • Taxa de sucesso: {success_rate:.1f}%
-        • Custo estimado: ${self.stats['total_cost']:.3f}
-        """)
+        """Log das estatísticas de uso (uma linha; stats também em extra para parsing)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        stats = self.stats
+        success_rate = (stats['successful_requests'] / max(stats['total_requests'], 1)) * 100
+        
+        logger.info(
+            "📊 firecrawl_stats total=%d ok=%d fail=%d cache_hits=%d rate=%.1f%% cost=$%.3f",
+            stats['total_requests'], stats['successful_requests'], stats['failed_requests'],
+            stats['cache_hits'], success_rate, stats['total_cost'],
+            extra={'stats': dict(stats)}
+        )
     
     def get_usage_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas de uso"""
@@ -317,10 +909,22 @@ class HybridScraper:
     """Scraper híbrido que combina FireCrawl com métodos tradicionais"""
     
     def __init__(self, firecrawl_config: FireCrawlConfig = None, 
-                 use_firecrawl_first: bool = True):
+                 use_firecrawl_first: bool = True,
+                 cache: ScrapeCache = None):
         self.use_firecrawl_first = use_firecrawl_first
         self.firecrawl_scraper = None
         
+        # Cache compartilhado entre FireCrawl e o método tradicional
+        self.cache = cache if cache is not None else ScrapeCache()
+        
+        # Circuit breaker do FireCrawl (atualizado por várias threads em scrape_urls)
+        self._fc_fail_streak = 0
+        self._fc_open_until = 0.0
+        self._fc_lock = threading.Lock()
+        
+        # Tamanho do pool HTTP montado na sessão do método tradicional
+        self._traditional_pool_size = None
+        
         # Tentar inicializar FireCrawl
         if FIRECRAWL_AVAILABLE and firecrawl_config and firecrawl_config.api_key:
             try:
@@ -333,24 +937,70 @@ class HybridScraper:
         from prompt_content_scraper import PromptContentExtractor
         self.traditional_scraper = PromptContentExtractor()
     
-    def scrape_url(self, url: str, prefer_firecrawl: bool = None) -> Dict[str, Any]:
+    def scrape_url(self, url: str, prefer_firecrawl: bool = None,
+                   force_rescrape: bool = False) -> ScrapeResult:
         """Scraping híbrido com fallback automático"""
         
+        # Cache antes de escolher o método
+        if not force_rescrape:
+            cached = self.cache.get(url)
+            if cached is not None:
+                logging.info(f"Cache hit: {url}")
+                return cached
+        
+        result = self._scrape_url_uncached(url, prefer_firecrawl)
+        self.cache.set(url, result)
+        return result
+    
+    def scrape_urls(self, urls: List[str], workers: int = HYBRID_WORKERS,
+                    prefer_firecrawl: bool = None) -> Iterator[ScrapeResult]:
+        """Scraping híbrido de várias URLs em paralelo (threads)
+        
+        Gera os resultados em ordem de conclusão; cada worker passa por
+        scrape_url, então cache, circuit breaker e fallback valem por URL.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        
+        # Uma sessão do método tradicional para todos os workers, com pool do mesmo tamanho
+        # (montado só quando o número de workers muda)
+        if self.traditional_scraper.session is None:
+            self.traditional_scraper.setup_session()
+            self._traditional_pool_size = None
+        if self._traditional_pool_size != workers:
+            self.traditional_scraper.session.mount(
+                "https://", HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            )
+            self._traditional_pool_size = workers
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.scrape_url, url, prefer_firecrawl)
+                       for url in unique_urls]
+            for future in as_completed(futures):
+                yield future.result()
+    
+    def _scrape_url_uncached(self, url: str, prefer_firecrawl: bool = None) -> ScrapeResult:
+        """Executa FireCrawl e/ou o método tradicional, sem consultar o cache"""
+        
         if prefer_firecrawl is None:
             prefer_firecrawl = self.use_firecrawl_first
         
-        # Método 1: FireCrawl (se disponível e preferido)
-        if prefer_firecrawl and self.firecrawl_scraper:
+        # Método 1: FireCrawl (se disponível, preferido e com o circuito fechado)
+        if prefer_firecrawl and self.firecrawl_scraper and time.monotonic() >= self._fc_open_until:
             try:
-                result = self.firecrawl_scraper.scrape_single_url(url)
+                # Timeout curto: com fallback disponível não vale esperar 30s
+                result = self.firecrawl_scraper.scrape_single_url(
+                    url, {'timeout': HYBRID_FIRECRAWL_TIMEOUT}
+                )
+                self._record_firecrawl_outcome(result.success)
                 
-                if result['success'] and result['content'].get('text'):
+                if result.success and result.text:
                     logging.info(f"✅ Sucesso com FireCrawl: {url}")
                     return result
                 else:
                     logging.warning(f"FireCrawl retornou pouco conteúdo para: {url}")
                     
             except Exception as e:
+                self._record_firecrawl_outcome(False)
                 logging.error(f"Erro no FireCrawl: {e}")
         
         # Método 2: Scraper tradicional (fallback)
@@ -366,36 +1016,43 @@ class HybridScraper:
             )
             
             # Converter para formato compatível
-            return {
-                'success': traditional_result.success,
-                'url': url,
-                'content': {
-                    'text': traditional_result.prompt_text,
-                    'title': traditional_result.title,
-                    'description': traditional_result.description,
-                    'markdown': traditional_result.prompt_text,
-                    'html': traditional_result.raw_html
-                },
-                'metadata': {
+            return ScrapeResult(
+                success=traditional_result.success,
+                url=url,
+                markdown=traditional_result.prompt_text,
+                html=traditional_result.raw_html,
+                text=traditional_result.prompt_text,
+                title=traditional_result.title,
+                description=traditional_result.description,
+                metadata={
                     'url': url,
                     'scraping_method': 'traditional',
                     'scraped_at': traditional_result.extracted_at,
                     'tags': traditional_result.tags,
                     'category': traditional_result.category
                 },
-                'error': traditional_result.error_message if not traditional_result.success else None
-            }
+                error=traditional_result.error_message if not traditional_result.success else None
+            )
             
         except Exception as e:
             logging.error(f"Erro no método tradicional: {e}")
             
-            return {
-                'success': False,
-                'url': url,
-                'error': f"Todos os métodos falharam: {str(e)}",
-                'content': {},
-                'metadata': {}
-            }
+            return ScrapeResult.failure(url, f"Todos os métodos falharam: {str(e)}")
+    
+    def _record_firecrawl_outcome(self, success: bool):
+        """Atualiza o circuit breaker; abre o circuito após falhas seguidas"""
+        with self._fc_lock:
+            if success:
+                self._fc_fail_streak = 0
+                return
+            
+            self._fc_fail_streak += 1
+            if self._fc_fail_streak < FIRECRAWL_FAILURE_THRESHOLD:
+                return
+            self._fc_open_until = time.monotonic() + FIRECRAWL_COOLDOWN_SECONDS
+            self._fc_fail_streak = 0
+        logging.warning(f"FireCrawl falhou {FIRECRAWL_FAILURE_THRESHOLD} vezes seguidas; "
+                        f"usando só o método tradicional por {FIRECRAWL_COOLDOWN_SECONDS}s")
     
     def get_cost_estimate(self, num_urls: int) -> Dict[str, float]:
         """Estima custos para diferentes métodos"""
@@ -453,12 +1110,12 @@ if __name__ == "__main__":
             for url in test_urls:
                 result = scraper.scrape_url(url)
                 
-                if result['success']:
+                if result.success:
                     print(f"✅ Sucesso: {url}")
-                    print(f"Título: {result['content']['title']}")
-                    print(f"Método: {result['metadata']['scraping_method']}")
+                    print(f"Título: {result.title}")
+                    print(f"Método: {result.metadata['scraping_method']}")
                 else:
-                    print(f"❌ Falha: {url} - {result.get('error')}")
+                    print(f"❌ Falha: {url} - {result.error}")
             
             # Mostrar estatísticas de custo
             if scraper.firecrawl_scraper:
@@ -8,13 +8,26 @@ import os
 import sys
 import time
 import logging
-import json
+import logging.handlers
+import asyncio
+import queue
+import threading
+from collections import Counter
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 # Importar todos os módulos desenvolvidos
-from extract_links import load_categories, extract_category_links, create_driver
+from extract_links import (
+    load_categories, extract_category_links, create_driver, fetch_category, USER_AGENT,
+    ListingCache, AsyncRateLimiter, json_bytes, loads_json
+)
 from login_automation import create_login_system
 from prompt_content_scraper import PromptContentExtractor, PromptData
 from storage_manager import create_storage_system, StorageConfig
@@ -22,6 +35,20 @@ from monitoring_system import create_monitoring_system
 from performance_optimizer import OptimizedScraper
 from anti_blocking_strategy import create_enhanced_scraper
 
+# Checkpoint regravado a cada N prompts gravados com sucesso
+CHECKPOINT_EVERY = 32
+
+
+def category_coverage(categories: List[Dict], link_counts: Dict[str, int]) -> List[tuple]:
+    """Calcula (nome, extraídos, esperados, %) por categoria, sem I/O"""
+    coverage = []
+    for category in categories:
+        cat_name = category['nome']
+        expected = category['quantidadeDePrompts']
+        extracted = link_counts.get(cat_name, 0)
+        coverage.append((cat_name, extracted, expected, extracted / max(expected, 1) * 100))
+    return coverage
+
 
 class IntegratedGodOfPromptScraper:
     """Scraper completo e integrado do GodOfPrompt.ai"""
@@ -34,7 +61,30 @@ class IntegratedGodOfPromptScraper:
         self.login_system = None
         self.content_extractor = None
         self.monitoring_system = None
+        self._dashboard = None
         self.performance_optimizer = None
+        self.listing_cache = None
+        self._log_listener = None
+        self._log_queue_handler = None
+        
+        # Gravação dos prompts em thread dedicada (sobrepõe extração e disco)
+        self._write_q = None
+        self._writer_thread = None
+        self._written_files = []
+        
+        # URLs já extraídas (checkpoint para retomar execuções interrompidas)
+        self._completed = set()
+        self._checkpoint_pending = 0
+        
+        # Prompts listados em mais de uma categoria: url -> categorias
+        self._url_categories = {}
+        
+        # Totais calculados uma única vez e reaproveitados nas fases seguintes
+        self._total_expected = 0
+        self._total_links = 0
+        self._link_counts = {}
+        self._success_count = 0
+        self._category_counts = Counter()
         
         # Estado da execução
         self.execution_stats = {
@@ -46,6 +96,25 @@ class IntegratedGodOfPromptScraper:
             'files_saved': 0
         }
         
+        # Identificador da execução (nome dos arquivos de metadados)
+        self._run_tag = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.execution_stats['start_time']))
+        
+        # Blocos invariantes dos metadados, montados uma única vez
+        self._metadata_template = {
+            'execution_info': None,
+            'statistics': None,
+            'configuration': {
+                'extract_content': self.config['extract_content'],
+                'storage_format': self.config['storage_format'],
+                'organize_by_category': self.config['organize_by_category'],
+                'test_mode': self.config['test_mode']
+            },
+            'system_info': {
+                'python_version': sys.version,
+                'storage_directory': self.config['base_directory']
+            }
+        }
+        
         self._setup_logging()
         self._initialize_systems()
     
@@ -63,13 +132,14 @@ class IntegratedGodOfPromptScraper:
             'firecrawl_api_key': os.getenv('FIRECRAWL_API_KEY', ''),
             
             # Armazenamento
-            'storage_format': 'markdown',     # markdown, json, txt
+            'storage_format': 'markdown',     # markdown, json, txt, zip-per-category
             'base_directory': 'godofprompt_data',
             
             # Performance
             'max_workers': 3,
             'batch_size': 5,
             'delays': {'min': 3, 'max': 8},
+            'requests_per_second': 5,         # Teto nas listagens (recua sozinho em 429/503)
             'use_cache': True,
             
             # Limites
@@ -91,18 +161,28 @@ class IntegratedGodOfPromptScraper:
     def _setup_logging(self):
         """Configura sistema de logging"""
         log_level = logging.DEBUG if self.config['verbose'] else logging.INFO
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(
-                    os.path.join(self.config['base_directory'], 'integrated_scraper.log')
-                ),
-                logging.StreamHandler()
-            ]
+        # Arquivo só é aberto no primeiro registro (após criar o diretório)
+        file_handler = logging.FileHandler(
+            os.path.join(self.config['base_directory'], 'integrated_scraper.log'),
+            delay=True
+        )
+        stream_handler = logging.StreamHandler()
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+        
+        # Registros vão para uma fila; a escrita em disco/terminal fica
+        # numa thread dedicada, fora do caminho da extração
+        log_queue = queue.Queue(-1)
+        self._log_queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
         )
         
+        logging.basicConfig(level=log_level, handlers=[self._log_queue_handler])
+        self._log_listener.start()
+        
         # Criar diretório de logs se não existe
         Path(self.config['base_directory']).mkdir(exist_ok=True)
     
@@ -110,6 +190,11 @@ class IntegratedGodOfPromptScraper:
         """Inicializa todos os sistemas necessários"""
         logging.info("🔧 Inicializando sistemas integrados...")
         
+        # Estrutura de diretórios criada uma única vez
+        base_directory = Path(self.config['base_directory'])
+        for subdir in ('metadata', 'prompts', 'links', '.cache'):
+            (base_directory / subdir).mkdir(parents=True, exist_ok=True)
+        
         # 1. Sistema de armazenamento
         storage_config = StorageConfig(
             base_dir=self.config['base_directory'],
@@ -136,7 +221,8 @@ class IntegratedGodOfPromptScraper:
         
         # 3. Sistema de monitoramento
         self.monitoring_system = create_monitoring_system()
-        self.monitoring_system['start']()
+        self.monitoring_system.start()
+        self._dashboard = self.monitoring_system.dashboard
         
         # 4. Otimizador de performance
         perf_config = {
@@ -148,12 +234,25 @@ class IntegratedGodOfPromptScraper:
         
         self.performance_optimizer = OptimizedScraper(perf_config)
         
+        # Cache HTTP das listagens (GETs condicionais entre execuções)
+        if self.config['use_cache']:
+            self.listing_cache = ListingCache(
+                os.path.join(self.config['base_directory'], '.http_cache.db')
+            )
+        
         # 5. Extrator de conteúdo (se necessário)
         if self.config['extract_content']:
+            self._completed = self._load_checkpoint()
+            
             self.content_extractor = PromptContentExtractor(
                 login_system=self.login_system,
-                monitor=self.monitoring_system['monitor']
+                monitor=self.monitoring_system.monitor
             )
+            
+            # Prompts são gravados à medida que são extraídos
+            self._write_q = queue.Queue(maxsize=256)
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
         
         logging.info("✅ Todos os sistemas inicializados")
     
@@ -170,16 +269,16 @@ class IntegratedGodOfPromptScraper:
             links_data = self._extract_all_links(categories)
             
             # Fase 3: Login e extração de conteúdo (se habilitado)
-            prompts_data = None
+            prompts_processed = None
             if self.config['extract_content'] and links_data:
                 if self._should_extract_content(links_data):
-                    prompts_data = self._extract_all_content(links_data)
+                    prompts_processed = self._extract_all_content(links_data)
             
             # Fase 4: Armazenamento inteligente
-            storage_results = self._store_results(links_data, prompts_data)
+            storage_results = self._store_results(links_data, prompts_processed)
             
             # Fase 5: Relatório final
-            return self._generate_final_report(categories, links_data, prompts_data, storage_results)
+            return self._generate_final_report(categories, links_data, prompts_processed, storage_results)
             
         except KeyboardInterrupt:
             logging.warning("⚠️  Execução interrompida pelo usuário")
@@ -190,6 +289,16 @@ class IntegratedGodOfPromptScraper:
         finally:
             self._cleanup()
     
+    def _confirm(self, message: str, default: str = 's') -> bool:
+        """Pede confirmação ao usuário
+        
+        Sem terminal (CI/cron) não bloqueia: a resposta vem da variável de
+        ambiente GODOFPROMPT_CONFIRM (s/y para sim), ou do default.
+        """
+        if not self.config['interactive'] or not sys.stdin.isatty():
+            return os.getenv('GODOFPROMPT_CONFIRM', default).lower().strip() in ('s', 'y')
+        return input(message).lower().strip() == 's'
+    
     def _load_and_configure_categories(self) -> List[Dict]:
         """Carrega e configura categorias para extração"""
         logging.info("📋 Carregando categorias...")
@@ -208,12 +317,12 @@ class IntegratedGodOfPromptScraper:
             print(f"  {i}. {cat['nome']}: {cat['quantidadeDePrompts']} prompts")
             total_esperado += cat['quantidadeDePrompts']
         
+        self._total_expected = total_esperado
         print(f"\n📊 Total esperado: {total_esperado} prompts")
         
         # Confirmação interativa
         if self.config['interactive']:
-            continuar = input("\nDeseja continuar? (s/n): ").lower().strip()
-            if continuar != 's':
+            if not self._confirm("\nDeseja continuar? (s/n): "):
                 print("❌ Extração cancelada pelo usuário")
                 sys.exit(0)
         
@@ -239,37 +348,76 @@ class IntegratedGodOfPromptScraper:
             results = self._extract_links_traditional(categories)
         
         # Contabilizar resultados
-        total_links = sum(len(links) for links in results.values())
-        self.execution_stats['links_extracted'] = total_links
+        self._link_counts = {cat_name: len(links) for cat_name, links in results.items()}
+        self._total_links = sum(self._link_counts.values())
+        self.execution_stats['links_extracted'] = self._total_links
         self.execution_stats['categories_processed'] = len(results)
         
-        print(f"✅ Extração de links concluída: {total_links} links extraídos")
+        print(f"✅ Extração de links concluída: {self._total_links} links extraídos")
         
         return results
     
     def _extract_links_traditional(self, categories: List[Dict]) -> Dict[str, List]:
-        """Método tradicional de extração de links (fallback)"""
+        """Método tradicional de extração de links (fallback)
+        
+        Listagens via HTTP concorrente primeiro; Selenium só para as
+        categorias que dependem de JavaScript.
+        """
         results = {}
+        if AIOHTTP_AVAILABLE:
+            results = asyncio.run(self._extract_links_async(categories))
+        
+        js_categories = [cat for cat in categories if results.get(cat['nome']) is None]
+        if not js_categories:
+            return results
+        
         driver = create_driver()
         
         try:
-            for i, category in enumerate(categories, 1):
-                print(f"\n🔄 [{i}/{len(categories)}] {category['nome']}")
+            for i, category in enumerate(js_categories, 1):
+                print(f"\n🔄 [{i}/{len(js_categories)}] {category['nome']} (Selenium)")
                 
                 links = extract_category_links(category, driver, should_close_driver=False)
                 results[category['nome']] = links
                 
                 print(f"✅ {len(links)} links extraídos")
-                time.sleep(2)  # Pausa entre categorias
         finally:
             if driver:
                 driver.quit()
         
         return results
     
+    async def _extract_links_async(self, categories: List[Dict]) -> Dict[str, Optional[List]]:
+        """Extrai as listagens das categorias concorrentemente via aiohttp
+        
+        O valor é None para categorias renderizadas via JavaScript.
+        """
+        semaphore = asyncio.Semaphore(self.config['max_workers'])
+        limiter = AsyncRateLimiter(self.config['requests_per_second'])
+        connector = aiohttp.TCPConnector(limit=self.config['max_workers'])
+        # Sem timeout total: a espera por uma conexão livre no pool não conta como falha
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=30)
+        
+        if self.listing_cache:
+            self.listing_cache.sync_categories(categories)
+        
+        async def fetch(session, category):
+            async with semaphore:
+                links = await fetch_category(session, category, self.listing_cache, limiter)
+            
+            if links is not None:
+                print(f"✅ {category['nome']}: {len(links)} links extraídos (HTTP)")
+            return category['nome'], links
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': USER_AGENT}) as session:
+            results = await asyncio.gather(*(fetch(session, category) for category in categories))
+        
+        return dict(results)
+    
     def _should_extract_content(self, links_data: Dict) -> bool:
         """Decide se deve extrair conteúdo dos prompts"""
-        total_links = sum(len(links) for links in links_data.values())
+        total_links = self._total_links
         
         if not self.config['extract_content']:
             return False
@@ -284,20 +432,24 @@ class IntegratedGodOfPromptScraper:
             print("⚠️  A extração de conteúdo pode demorar muito tempo!")
             
             if not self.config['test_mode']:
-                continuar = input("Deseja continuar com extração de conteúdo? (s/n): ").lower().strip()
-                if continuar != 's':
+                if not self._confirm("Deseja continuar com extração de conteúdo? (s/n): "):
                     return False
         
         return True
     
-    def _extract_all_content(self, links_data: Dict) -> List[PromptData]:
-        """Extrai conteúdo completo de todos os prompts"""
+    def _extract_all_content(self, links_data: Dict) -> Optional[int]:
+        """Extrai conteúdo completo de todos os prompts
+        
+        Cada prompt segue para a thread de gravação assim que fica pronto;
+        retorna apenas quantos foram processados (None se a fase foi pulada).
+        """
         self.execution_stats['phase'] = 'content_extraction'
         
         print("\n📝 === FASE 2: EXTRAÇÃO DE CONTEÚDO ===")
         logging.info("Iniciando extração de conteúdo...")
         
         # Login automático
+        session_data = {}
         if self.login_system:
             print("🔐 Realizando login...")
             success, session_data = self.login_system.perform_login(use_headless=True)
@@ -308,35 +460,205 @@ class IntegratedGodOfPromptScraper:
             
             print("✅ Login realizado com sucesso")
         
-        # Preparar lista de URLs
-        all_urls = []
+        # Preparar lista de URLs (cada prompt é baixado uma única vez, mesmo
+        # quando listado em várias categorias)
+        seen = {}
         for category_name, links in links_data.items():
             for link_data in links:
-                all_urls.append({
-                    'url': link_data['url'],
+                url = link_data['url']
+                if url in seen:
+                    seen[url]['categories'].append(category_name)
+                    continue
+                seen[url] = {
+                    'url': url,
                     'id': link_data.get('id', 'unknown'),
                     'category': category_name,
+                    'categories': [category_name],
                     'name': link_data.get('name', 'Sem título')
-                })
+                }
+        all_urls = list(seen.values())
+        self._url_categories = {
+            entry['url']: entry['categories'] for entry in all_urls if len(entry['categories']) > 1
+        }
+        if self._url_categories:
+            logging.info(f"{len(self._url_categories)} prompts listados em mais de uma categoria")
+        
+        # Pular prompts já extraídos em execuções anteriores
+        if self._completed:
+            pending_urls = [u for u in all_urls if u['url'] not in self._completed]
+            print(f"♻️  Retomando do checkpoint: {len(all_urls) - len(pending_urls)} prompts já extraídos")
+            all_urls = pending_urls
         
         # Extrair conteúdo
-        if self.content_extractor:
-            prompts_data = self.content_extractor.extract_multiple_prompts(
-                all_urls, max_workers=self.config['max_workers']
-            )
-        else:
+        if not self.content_extractor:
             print("❌ Extrator de conteúdo não inicializado")
             return None
         
-        # Contabilizar
-        successful_extractions = sum(1 for p in prompts_data if p.success)
-        self.execution_stats['prompts_extracted'] = successful_extractions
+        extract = self.content_extractor.extract_multiple_prompts_iter
+        enqueue = self._enqueue_prompt
+        pending = all_urls
+        if AIOHTTP_AVAILABLE:
+            # Falhas via HTTP passam pelo extrator completo (requests + Selenium)
+            pending = asyncio.run(self._extract_all_content_async(all_urls, session_data))
+            if pending:
+                logging.info(f"{len(pending)} prompts sem conteúdo via aiohttp - usando extrator tradicional")
+        
+        for prompt in extract(pending, max_workers=self.config['max_workers']):
+            enqueue(prompt)
         
-        print(f"✅ Extração de conteúdo concluída: {successful_extractions}/{len(all_urls)}")
+        # Contabilizar (sucessos contados à medida que os prompts chegam)
+        self.execution_stats['prompts_extracted'] = self._success_count
         
-        return prompts_data
+        print(f"✅ Extração de conteúdo concluída: {self._success_count}/{len(all_urls)}")
+        
+        return len(all_urls)
     
-    def _store_results(self, links_data: Dict, prompts_data: List[PromptData] = None) -> Dict[str, Any]:
+    async def _extract_all_content_async(self, all_urls: List[Dict], 
+                                         session_data: Dict) -> List[Dict]:
+        """Baixa os prompts concorrentemente em uma sessão aiohttp com keep-alive
+        
+        Usa os cookies/headers do login; o parsing continua no
+        PromptContentExtractor. Prompts extraídos vão direto para a thread de
+        gravação; retorna as entradas de all_urls que falharam.
+        """
+        extractor = self.content_extractor
+        monitor = self.monitoring_system.monitor if self.monitoring_system else None
+        semaphore = asyncio.Semaphore(self.config['max_workers'])
+        
+        jar = aiohttp.CookieJar()
+        jar.update_cookies(session_data.get('cookies', {}))
+        connector = aiohttp.TCPConnector(limit=50, limit_per_host=10, keepalive_timeout=75)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=15,
+                                        sock_read=extractor.extraction_config['timeout'])
+        headers = session_data.get('headers') or {'User-Agent': USER_AGENT}
+        
+        async def fetch(session, prompt):
+            prompt_data = PromptData(
+                id=prompt.get('id', 'unknown'),
+                title="",
+                url=prompt['url'],
+                category=prompt.get('category', 'unknown'),
+                extracted_at=time.strftime("%Y-%m-%d %H:%M:%S")
+            )
+            start_time = time.time()
+            html = None
+            
+            async with semaphore:
+                try:
+                    async with session.get(prompt['url']) as response:
+                        final_url = str(response.url)
+                        if response.status != 200:
+                            prompt_data.error_message = f"Status code {response.status}"
+                        elif 'signin' in final_url or 'login' in final_url:
+                            # Redirecionado para login (paywall)
+                            prompt_data.error_message = "Redirecionado para login"
+                        else:
+                            html = await response.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+                    # Falha só deste prompt: o extrator tradicional tenta de novo
+                    prompt_data.error_message = str(e) or type(e).__name__
+            
+            if html is not None:
+                extractor.parse_html(prompt_data, html)
+            
+            if monitor:
+                monitor.record_request(prompt_data.success, time.time() - start_time,
+                                       prompt_data.error_message if not prompt_data.success else None)
+            
+            # Falhas só são gravadas após a nova tentativa com o extrator tradicional
+            if prompt_data.success:
+                self._enqueue_prompt(prompt_data)
+                return None
+            return prompt
+        
+        async with aiohttp.ClientSession(cookie_jar=jar, connector=connector,
+                                         timeout=timeout, headers=headers) as session:
+            results = await asyncio.gather(*(fetch(session, prompt) for prompt in all_urls))
+        
+        return [prompt for prompt in results if prompt is not None]
+    
+    def _enqueue_prompt(self, prompt: PromptData):
+        """Envia um prompt extraído para a thread de gravação
+        
+        A conversão para dict fica a cargo da thread de gravação, fora do
+        caminho da extração.
+        """
+        if prompt.success:
+            self._success_count += 1
+            # URL listada em várias categorias conta para todas elas
+            for category in self._url_categories.get(prompt.url, [prompt.category]):
+                self._category_counts[category] += 1
+        self._write_q.put(prompt)
+    
+    def _writer_loop(self):
+        """Consome a fila gravando os prompts; None encerra a thread"""
+        prompt_storage = self.storage_system.prompt_storage
+        while True:
+            prompt = self._write_q.get()
+            try:
+                if prompt is None:
+                    return
+                prompt_dict = prompt.to_dict()
+                categories = self._url_categories.get(prompt.url)
+                if categories:
+                    prompt_dict['categories'] = categories
+                self._written_files.append(prompt_storage.save_prompt(prompt_dict))
+                if prompt.success:
+                    self._completed.add(prompt.url)
+                    self._checkpoint_if_due()
+            except Exception as e:
+                logging.error(f"Erro salvando prompt {prompt.url}: {e}")
+            finally:
+                self._write_q.task_done()
+    
+    def _stop_writer(self):
+        """Grava o que resta na fila e encerra a thread de gravação"""
+        if self._writer_thread is None:
+            return
+        self._write_q.put(None)
+        self._writer_thread.join()
+        self._writer_thread = None
+    
+    def _checkpoint_path(self) -> str:
+        """Caminho do checkpoint de progresso da extração"""
+        return os.path.join(self.config['base_directory'], '.checkpoint.json')
+    
+    def _load_checkpoint(self) -> set:
+        """Carrega as URLs já extraídas do checkpoint anterior (se existir)"""
+        try:
+            with open(self._checkpoint_path(), 'rb') as f:
+                checkpoint = loads_json(f.read())
+        except FileNotFoundError:
+            return set()
+        except ValueError as e:
+            logging.warning(f"⚠️  Checkpoint inválido ignorado: {e}")
+            return set()
+        
+        completed = set(checkpoint.get('completed_urls', []))
+        logging.info(f"♻️  Checkpoint carregado: {len(completed)} prompts já extraídos")
+        return completed
+    
+    def _checkpoint_if_due(self):
+        """Regrava o checkpoint a cada CHECKPOINT_EVERY prompts gravados"""
+        self._checkpoint_pending += 1
+        if self._checkpoint_pending >= CHECKPOINT_EVERY:
+            self._save_checkpoint()
+    
+    def _save_checkpoint(self):
+        """Grava o checkpoint de forma atômica (arquivo temporário + os.replace)"""
+        self._checkpoint_pending = 0
+        checkpoint = {
+            'execution_stats': self.execution_stats,
+            'completed_urls': sorted(self._completed)
+        }
+        
+        final_path = self._checkpoint_path()
+        tmp_path = final_path + '.tmp'
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(json_bytes(checkpoint))
+        os.replace(tmp_path, final_path)
+    
+    def _store_results(self, links_data: Dict, prompts_processed: Optional[int] = None) -> Dict[str, Any]:
         """Armazena resultados no sistema de arquivos"""
         self.execution_stats['phase'] = 'storage'
         
@@ -344,17 +666,16 @@ class IntegratedGodOfPromptScraper:
         logging.info("Iniciando armazenamento de dados...")
         
         storage_results = {'files_created': [], 'directories_created': []}
+        files_created = storage_results['files_created']
         
-        # Armazenar prompts completos (se disponíveis)
-        if prompts_data:
-            print("📄 Salvando prompts completos em arquivos individuais...")
+        # Prompts completos já foram enviados à thread de gravação durante a extração
+        if prompts_processed:
+            print("📄 Finalizando gravação dos prompts em arquivos individuais...")
             
-            # Converter PromptData para dict
-            prompts_dict = [prompt.to_dict() for prompt in prompts_data]
-            
-            # Salvar usando sistema de armazenamento
-            prompt_files = self.storage_system.prompt_storage.save_multiple_prompts(prompts_dict)
-            storage_results['files_created'].extend(prompt_files)
+            self._write_q.join()
+            self.storage_system.prompt_storage.close_archives()
+            prompt_files = list(self._written_files)
+            files_created.extend(prompt_files)
             
             print(f"✅ {len(prompt_files)} arquivos de prompt salvos")
         
@@ -367,73 +688,65 @@ class IntegratedGodOfPromptScraper:
             for category, links in links_data.items():
                 formatted_links_data[category] = links
             
-            links_file = self.storage_system.links_storage.save_links_by_category(formatted_links_data)
-            storage_results['files_created'].append(links_file)
+            save_links = self.storage_system.links_storage.save_links_by_category
+            links_file = save_links(formatted_links_data)
+            files_created.append(links_file)
             
             print(f"✅ Links salvos em: {os.path.basename(links_file)}")
         
         # Salvar metadados da execução
         metadata = self._generate_execution_metadata()
         metadata_file = self._save_execution_metadata(metadata)
-        storage_results['files_created'].append(metadata_file)
+        files_created.append(metadata_file)
         
-        self.execution_stats['files_saved'] = len(storage_results['files_created'])
+        self.execution_stats['files_saved'] = len(files_created)
         
         return storage_results
     
     def _generate_execution_metadata(self) -> Dict:
-        """Gera metadados da execução atual"""
+        """Gera metadados da execução atual
+        
+        Só execution_info e statistics mudam; configuração e sistema vêm do
+        template montado no __init__.
+        """
         current_time = time.time()
         
-        return {
-            'execution_info': {
-                'start_time': datetime.fromtimestamp(self.execution_stats['start_time']).isoformat(),
-                'end_time': datetime.fromtimestamp(current_time).isoformat(),
-                'duration_seconds': current_time - self.execution_stats['start_time'],
-                'phase': self.execution_stats['phase']
-            },
-            'statistics': {
-                'categories_processed': self.execution_stats['categories_processed'],
-                'links_extracted': self.execution_stats['links_extracted'],
-                'prompts_extracted': self.execution_stats['prompts_extracted'],
-                'files_saved': self.execution_stats['files_saved']
-            },
-            'configuration': {
-                'extract_content': self.config['extract_content'],
-                'storage_format': self.config['storage_format'],
-                'organize_by_category': self.config['organize_by_category'],
-                'test_mode': self.config['test_mode']
-            },
-            'system_info': {
-                'python_version': sys.version,
-                'storage_directory': self.config['base_directory']
-            }
+        metadata = dict(self._metadata_template)
+        metadata['execution_info'] = {
+            'start_time': datetime.fromtimestamp(self.execution_stats['start_time']).isoformat(),
+            'end_time': datetime.fromtimestamp(current_time).isoformat(),
+            'duration_seconds': current_time - self.execution_stats['start_time'],
+            'phase': self.execution_stats['phase']
+        }
+        metadata['statistics'] = {
+            'categories_processed': self.execution_stats['categories_processed'],
+            'links_extracted': self.execution_stats['links_extracted'],
+            'prompts_extracted': self.execution_stats['prompts_extracted'],
+            'files_saved': self.execution_stats['files_saved']
         }
+        return metadata
     
     def _save_execution_metadata(self, metadata: Dict) -> str:
         """Salva metadados da execução"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"execution_metadata_{timestamp}.json"
-        filepath = os.path.join(self.config['base_directory'], 'metadata', filename)
+        filename = f"execution_metadata_{self._run_tag}.json"
+        filepath = Path(self.config['base_directory'], 'metadata', filename)
         
-        # Garantir que diretório existe
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # Serializado de uma vez (orjson) e gravado numa única escrita;
+        # o diretório já foi criado em _initialize_systems
+        filepath.write_bytes(json_bytes(metadata, indent=True))
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
-        
-        return filepath
+        return str(filepath)
     
     def _generate_final_report(self, categories: List[Dict], links_data: Dict, 
-                              prompts_data: List[PromptData], storage_results: Dict) -> Dict[str, Any]:
+                              prompts_processed: Optional[int], storage_results: Dict) -> Dict[str, Any]:
         """Gera relatório final da execução"""
         
         print("\n🎉 === RELATÓRIO FINAL ===")
         
         # Estatísticas básicas
-        total_expected = sum(cat['quantidadeDePrompts'] for cat in categories)
-        total_links = sum(len(links) for links in links_data.values()) if links_data else 0
-        total_prompts = len([p for p in prompts_data if p.success]) if prompts_data else 0
+        total_expected = self._total_expected
+        total_links = self._total_links if links_data else 0
+        total_prompts = self._success_count if prompts_processed else 0
         
         duration = time.time() - self.execution_stats['start_time']
         
@@ -443,24 +756,25 @@ class IntegratedGodOfPromptScraper:
         print(f"📊 Categorias processadas: {len(categories)}")
         print(f"🔗 Links extraídos: {total_links}/{total_expected} ({(total_links/max(total_expected,1))*100:.1f}%)")
         
-        if prompts_data:
+        if prompts_processed:
             print(f"📝 Prompts completos: {total_prompts}/{total_links} ({(total_prompts/max(total_links,1))*100:.1f}%)")
         
         print(f"💾 Arquivos criados: {len(storage_results['files_created'])}")
         
         # Estatísticas por categoria
         if links_data:
+            coverage = category_coverage(categories, self._link_counts)
+            prompt_counts = self._category_counts
             print("\n📈 Detalhes por categoria:")
-            for category in categories:
-                cat_name = category['nome']
-                expected = category['quantidadeDePrompts']
-                extracted = len(links_data.get(cat_name, []))
-                percentage = (extracted / max(expected, 1)) * 100
-                print(f"  • {cat_name}: {extracted}/{expected} ({percentage:.1f}%)")
-        
-        # Performance do sistema
-        if self.monitoring_system:
-            dashboard = self.monitoring_system['dashboard']()
+            print("\n".join(
+                f"  • {cat_name}: {extracted}/{expected} ({percentage:.1f}%)"
+                + (f" - {prompt_counts[cat_name]} prompts completos" if prompts_processed else "")
+                for cat_name, extracted, expected, percentage in coverage
+            ))
+        
+        # Performance do sistema (dashboard gerado uma vez para exibição e retorno)
+        dashboard = self._dashboard() if self._dashboard else None
+        if dashboard:
             print(f"\n⚡ Performance:")
             print(f"  • Taxa de sucesso: {dashboard['performance']['success_rate']:.1%}")
             print(f"  • Tempo médio/requisição: {dashboard['performance']['avg_response_time']:.1f}s")
@@ -469,7 +783,7 @@ class IntegratedGodOfPromptScraper:
         print(f"\n📁 Arquivos salvos em:")
         print(f"  • Base: {self.config['base_directory']}/")
         
-        if prompts_data:
+        if prompts_processed:
             print(f"  • Prompts: {self.config['base_directory']}/prompts/")
         if links_data:
             print(f"  • Links: {self.config['base_directory']}/links/")
@@ -482,6 +796,7 @@ class IntegratedGodOfPromptScraper:
                 'total_expected': total_expected,
                 'links_extracted': total_links,
                 'prompts_extracted': total_prompts,
+                'prompts_by_category': dict(self._category_counts),
                 'categories_processed': len(categories),
                 'files_created': len(storage_results['files_created'])
             },
@@ -489,7 +804,7 @@ class IntegratedGodOfPromptScraper:
                 'base_directory': self.config['base_directory'],
                 'files_created': storage_results['files_created']
             },
-            'performance': self.monitoring_system['dashboard']() if self.monitoring_system else None
+            'performance': dashboard
         }
         
         return report
@@ -498,13 +813,40 @@ class IntegratedGodOfPromptScraper:
         """Limpa recursos utilizados"""
         logging.info("🧹 Limpando recursos...")
         
+        self._stop_writer()
+        if self.storage_system:
+            self.storage_system.prompt_storage.close_archives()
+        
+        if self._completed:
+            try:
+                self._save_checkpoint()
+            except OSError as e:
+                logging.warning(f"⚠️  Falha ao salvar checkpoint: {e}")
+        
         if self.monitoring_system:
-            self.monitoring_system['stop']()
+            self.monitoring_system.stop()
         
         if self.login_system:
             self.login_system.cleanup()
         
+        if self.listing_cache:
+            self.listing_cache.close()
+        
         logging.info("✅ Limpeza concluída")
+        self._stop_log_listener()
+    
+    def _stop_log_listener(self):
+        """Esvazia a fila de logs e volta a escrever direto nos handlers"""
+        if self._log_listener is None:
+            return
+        
+        self._log_listener.stop()
+        root = logging.getLogger()
+        if self._log_queue_handler in root.handlers:
+            root.removeHandler(self._log_queue_handler)
+            for handler in self._log_listener.handlers:
+                root.addHandler(handler)
+        self._log_listener = None
 
 
 # Funções de conveniência para uso fácil
@@ -5,8 +5,14 @@ Sistema de automação de login para bypass de paywall no GodOfPrompt.ai
 
 import time
 import json
+import re
 import logging
 import os
+import atexit
+import shutil
+import socket
+import threading
+from collections import deque
 from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from selenium import webdriver
@@ -14,10 +20,132 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import requests
 from urllib.parse import urljoin, urlparse
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Preenche um input em uma única chamada ao WebDriver. Usa o setter nativo de
+# "value" para que frameworks (React etc.) percebam a mudança via input/change.
+_FAST_FILL_JS = """
+const element = arguments[0];
+const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+setter.call(element, arguments[1]);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+
+def _write_json(path: str, data):
+    """Grava JSON de forma atômica (arquivo temporário + os.replace)
+    
+    Usa orjson quando disponível; quem lê nunca vê um arquivo pela metade.
+    """
+    payload = orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode('utf-8')
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    """Lê JSON em modo binário (orjson quando disponível)"""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+
+# Trechos do HTML que indicam usuário logado
+_SUCCESS_KEYWORDS = ['dashboard', 'premium content', 'logout', 'profile']
+
+# Verificação de login feita no navegador: só o motivo (ou false) volta pelo
+# WebDriver, em vez do page_source inteiro a cada consulta
+_LOGIN_CHECK_JS = """
+var url = location.href.toLowerCase();
+var indicators = %s;
+for (var i = 0; i < indicators.length; i++) {
+    if (url.indexOf(indicators[i]) >= 0) return 'URL: ' + indicators[i];
+}
+var html = document.documentElement.outerHTML.toLowerCase();
+var keywords = %s;
+for (var j = 0; j < keywords.length; j++) {
+    if (html.indexOf(keywords[j]) >= 0) return 'conteúdo: ' + keywords[j];
+}
+if (url.indexOf('signin') < 0 && url.indexOf('login') < 0) return 'redirect';
+return false;
+"""
+
+# URL ainda na página de login (checagem de estabilização após redirect)
+_LOGIN_PAGE_RE = re.compile(r'signin|login')
+
+# User-Agent do navegador de login, repetido no login via HTTP
+_USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+               "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# Token CSRF embutido na página de login (meta tag ou input oculto)
+_CSRF_RE = re.compile(
+    r'name=["\'](?:csrf[-_]?token|_csrf|csrfToken)["\'][^>]*?(?:content|value)=["\']([^"\']+)',
+    re.IGNORECASE
+)
+
+# Resposta de login que exige interação humana: só o Selenium resolve
+_CAPTCHA_RE = re.compile(r'captcha|turnstile|challenge', re.IGNORECASE)
+
+# Sinais positivos de usuário logado no HTML da página protegida ("dashboard"
+# fica de fora: aparece na própria página mesmo sem login)
+_LOGGED_IN_RE = re.compile(
+    '|'.join(re.escape(k) for k in _SUCCESS_KEYWORDS if k != 'dashboard'),
+    re.IGNORECASE
+)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Verifica se o processo existe (sinal 0 não afeta o processo)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Existe, mas pertence a outro usuário
+    return True
+
+
+def _profile_in_use(profile_dir: str) -> bool:
+    """Indica se há um Chrome vivo usando o perfil
+    
+    Travas órfãs (Chrome encerrado por crash/SIGKILL) não contam: o Chrome
+    as reaproveita ao abrir o perfil.
+    """
+    # Linux/macOS: SingletonLock é um symlink para "<host>-<pid>"
+    singleton = os.path.join(profile_dir, 'SingletonLock')
+    try:
+        host, _, pid = os.readlink(singleton).rpartition('-')
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return True  # Trava em formato inesperado: não arriscar
+    else:
+        if host != socket.gethostname() or not pid.isdigit():
+            return True  # Outra máquina (perfil em disco compartilhado)
+        return _pid_alive(int(pid))
+    
+    # Windows: "lockfile" fica aberto com exclusividade enquanto o Chrome roda
+    lockfile = os.path.join(profile_dir, 'lockfile')
+    if not os.path.exists(lockfile):
+        return False
+    try:
+        os.remove(lockfile)  # Órfão: removido sem erro
+    except PermissionError:
+        return True
+    except OSError:
+        pass
+    return False
+
 
 @dataclass
 class LoginCredentials:
@@ -33,15 +161,43 @@ class SessionConfig:
     """Configuração de sessão"""
     session_timeout: int = 3600  # 1 hora
     max_login_attempts: int = 3
+    # Sessão completa (cookies, headers e validade) em um único arquivo;
+    # headers_file só é lido para migrar sessões salvas no formato antigo
     cookie_file: str = "session_cookies.json"
     headers_file: str = "session_headers.json"
     
+    # Sessão mantida em memória; gravada em disco no máximo a cada N segundos
+    # (e sempre no cleanup()/saída do processo)
+    session_flush_interval: float = 30.0
+    
+    # Perfil e cache do Chrome persistentes entre execuções (contêm cookies
+    # de login: fora do controle de versão). Um perfil só aceita um Chrome
+    # vivo por vez: com o perfil em uso, cada LoginAutomator cria o seu
+    # ("<profile_dir>-<pid>-<id>"); travas órfãs de um crash são ignoradas
+    profile_dir: str = ".chrome_profile"
+    cache_dir: str = ".chrome_cache"
+    
+    # Manter o navegador aberto ao final e reconectar a ele na próxima
+    # execução (session_id + endereço do chromedriver salvos em disco)
+    keep_browser_alive: bool = False
+    browser_session_file: str = "browser_session.json"
+    
     # Seletores do site (podem mudar)
     login_url: str = "https://www.godofprompt.ai/auth/signin"
     email_selector: str = 'input[type="email"]'
     password_selector: str = 'input[type="password"]'
     login_button_selector: str = 'button[type="submit"]'
     
+    # Login direto via HTTP (POST de credenciais), tentado antes do Selenium.
+    # Desativado (None) até o endpoint real ser confirmado no navegador; a
+    # página de verificação precisa exigir login.
+    http_login_url: Optional[str] = None
+    http_login_check_url: str = "https://www.godofprompt.ai/dashboard"
+    
+    # Digitação caractere a caractere (só fora do modo headless); desligada,
+    # os campos são preenchidos via JavaScript em uma única chamada
+    human_like_typing: bool = True
+    
     # Indicadores de login bem-sucedido
     success_indicators: List[str] = None
     
@@ -55,6 +211,19 @@ class SessionConfig:
             ]
 
 
+class _AttachedRemote(webdriver.Remote):
+    """webdriver.Remote que se conecta a uma sessão existente em vez de criar outra"""
+    
+    def __init__(self, command_executor: str, session_id: str):
+        self._attach_session_id = session_id
+        super().__init__(command_executor=command_executor, options=Options())
+    
+    def start_session(self, capabilities, *args, **kwargs):
+        # Pula o handshake "new session": usa a sessão já aberta
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+
 class SessionManager:
     """Gerenciador de sessão com persistência"""
     
@@ -63,39 +232,76 @@ class SessionManager:
         self.session_cookies = {}
         self.session_headers = {}
         self.session_valid_until = 0
+        
+        # Gravação adiada: _dirty marca mudanças ainda não gravadas
+        self._dirty = False
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
+        
         self.load_session()
     
     def save_session(self, cookies: Dict, headers: Dict):
-        """Salva sessão no disco"""
-        try:
-            # Salvar cookies
-            with open(self.config.cookie_file, 'w') as f:
-                json.dump(cookies, f)
-            
-            # Salvar headers
-            with open(self.config.headers_file, 'w') as f:
-                json.dump(headers, f)
-            
-            # Definir validade
+        """Atualiza a sessão em memória e agenda a gravação em disco"""
+        with self._flush_lock:
+            self.session_cookies = cookies
+            self.session_headers = headers
             self.session_valid_until = time.time() + self.config.session_timeout
+            self._dirty = True
+            
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.config.session_flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        logging.info("Sessão atualizada (gravação em disco agendada)")
+    
+    def flush(self):
+        """Grava a sessão em disco se houver mudanças pendentes"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
             
-            logging.info("Sessão salva com sucesso")
+            if not self._dirty:
+                return
             
-        except Exception as e:
-            logging.error(f"Erro salvando sessão: {e}")
+            try:
+                # Cookies, headers e validade juntos: uma única escrita atômica
+                _write_json(self.config.cookie_file, {
+                    'cookies': self.session_cookies,
+                    'headers': self.session_headers,
+                    'valid_until': self.session_valid_until
+                })
+                self._dirty = False
+                logging.info("Sessão salva com sucesso")
+                
+            except Exception as e:
+                logging.error(f"Erro salvando sessão: {e}")
     
     def load_session(self) -> bool:
         """Carrega sessão do disco"""
         try:
-            # Carregar cookies
-            if os.path.exists(self.config.cookie_file):
-                with open(self.config.cookie_file, 'r') as f:
-                    self.session_cookies = json.load(f)
+            # Abrir direto (sem os.path.exists antes): ausência vira FileNotFoundError
+            try:
+                saved = _read_json(self.config.cookie_file)
+            except FileNotFoundError:
+                return False
             
-            # Carregar headers
-            if os.path.exists(self.config.headers_file):
-                with open(self.config.headers_file, 'r') as f:
-                    self.session_headers = json.load(f)
+            if 'cookies' in saved and 'valid_until' in saved:
+                self.session_cookies = saved['cookies']
+                self.session_headers = saved.get('headers', {})
+                self.session_valid_until = saved['valid_until']
+            else:
+                # Formato antigo: só cookies, sem validade gravada; a sessão
+                # vale session_timeout a partir da última gravação do arquivo
+                self.session_cookies = saved
+                self.session_valid_until = (os.path.getmtime(self.config.cookie_file)
+                                            + self.config.session_timeout)
+                try:
+                    self.session_headers = _read_json(self.config.headers_file)
+                except FileNotFoundError:
+                    pass
             
             # Verificar se ainda é válida
             if time.time() < self.session_valid_until and self.session_cookies:
@@ -115,15 +321,22 @@ class SessionManager:
     
     def clear_session(self):
         """Limpa sessão atual"""
-        self.session_cookies = {}
-        self.session_headers = {}
-        self.session_valid_until = 0
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._dirty = False
+            
+            self.session_cookies = {}
+            self.session_headers = {}
+            self.session_valid_until = 0
         
         # Remover arquivos
         for file in [self.config.cookie_file, self.config.headers_file]:
             try:
-                if os.path.exists(file):
-                    os.remove(file)
+                os.remove(file)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logging.warning(f"Erro removendo {file}: {e}")
 
@@ -136,14 +349,33 @@ class LoginAutomator:
         self.config = config or SessionConfig()
         self.session_manager = SessionManager(self.config)
         self.driver = None
+        # Perfil próprio criado quando o configurado estava em uso (ver _profile_dir)
+        self._instance_profile_dir = None
+        
+        # Indicadores normalizados uma única vez, não a cada consulta
+        self._login_check_js = _LOGIN_CHECK_JS % (
+            json.dumps([indicator.lower() for indicator in self.config.success_indicators]),
+            json.dumps(_SUCCESS_KEYWORDS)
+        )
     
-    def create_driver(self) -> webdriver.Chrome:
-        """Cria driver otimizado para login"""
+    def create_driver(self, headless: bool = False) -> webdriver.Chrome:
+        """Cria driver otimizado para login
+        
+        O driver é reaproveitado entre tentativas e sessões; só cleanup() o encerra.
+        """
         if self.driver:
             return self.driver
+        
+        if self.config.keep_browser_alive:
+            self.driver = self.attach_session()
+            if self.driver:
+                return self.driver
             
         chrome_options = Options()
         
+        if headless:
+            chrome_options.add_argument("--headless")
+        
         # Configurações para parecer usuário real
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -151,20 +383,28 @@ class LoginAutomator:
         chrome_options.add_argument("--window-size=1366,768")  # Tamanho comum
         
         # User-Agent realista
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        chrome_options.add_argument(f"--user-agent={_USER_AGENT}")
         
         # Anti-detecção
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
-        # Manter perfil para cookies
-        chrome_options.add_argument("--disable-web-security")
+        # Manter perfil (cookies) e cache HTTP entre execuções
+        chrome_options.add_argument(f"--user-data-dir={self._profile_dir()}")
+        chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(self.config.cache_dir)}")
         chrome_options.add_argument("--allow-running-insecure-content")
-        
+
+        # A página de login só precisa dos campos e do botão: sem imagens/notificações
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+        # driver.get retorna no DOMContentLoaded; os campos são aguardados com WebDriverWait
+        chrome_options.page_load_strategy = "eager"
+
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.set_page_load_timeout(30)
         
@@ -173,8 +413,72 @@ class LoginAutomator:
         
         return self.driver
     
+    def _profile_dir(self) -> str:
+        """Diretório de perfil do Chrome para este automator
+        
+        Um perfil só pode ser aberto por um Chrome por vez. Se o configurado
+        estiver em uso (outro LoginAutomator ou um navegador mantido aberto),
+        usa um perfil próprio desta instância, sem os cookies persistidos.
+        """
+        profile_dir = os.path.abspath(self.config.profile_dir)
+        if not _profile_in_use(profile_dir):
+            return profile_dir
+        
+        self._instance_profile_dir = f"{profile_dir}-{os.getpid()}-{id(self):x}"
+        logging.warning(f"Perfil {profile_dir} em uso - usando {self._instance_profile_dir}")
+        return self._instance_profile_dir
+    
+    def attach_session(self) -> Optional[webdriver.Remote]:
+        """Reconecta ao navegador deixado aberto pela execução anterior
+        
+        Retorna None (e descarta o registro salvo) se ele não responder.
+        """
+        try:
+            saved = _read_json(self.config.browser_session_file)
+            
+            driver = _AttachedRemote(saved['executor'], saved['session_id'])
+            driver._is_remote = False
+            _ = driver.current_url  # Validação barata: falha se a sessão morreu
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.info(f"Navegador da execução anterior indisponível: {e}")
+            self._forget_browser_session()
+            return None
+        
+        logging.info("Reconectado ao navegador da execução anterior")
+        return driver
+    
+    def _save_browser_session(self, driver):
+        """Registra session_id e endereço do chromedriver para attach_session()"""
+        executor = driver.command_executor
+        executor_url = getattr(executor, '_url', None)
+        if executor_url is None:
+            executor_url = getattr(getattr(executor, '_client_config', None), 'remote_server_addr', None)
+        if not executor_url:
+            return
+        
+        try:
+            _write_json(self.config.browser_session_file,
+                        {'session_id': driver.session_id, 'executor': executor_url})
+        except OSError as e:
+            logging.warning(f"Erro salvando sessão do navegador: {e}")
+    
+    def _forget_browser_session(self):
+        """Remove o registro da sessão do navegador"""
+        try:
+            os.remove(self.config.browser_session_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Erro removendo {self.config.browser_session_file}: {e}")
+    
     def perform_login(self, use_headless: bool = False) -> Tuple[bool, Dict]:
-        """Executa processo completo de login"""
+        """Executa processo completo de login
+        
+        O modo (headless ou não) é decidido aqui e vale para todas as
+        tentativas, que reaproveitam o mesmo navegador.
+        """
         
         # Verificar se já temos sessão válida
         if self.session_manager.is_session_valid():
@@ -184,6 +488,18 @@ class LoginAutomator:
                 'headers': self.session_manager.session_headers
             }
         
+        # Caminho rápido: login só com requests, sem abrir o Chrome
+        if self.config.http_login_url:
+            success, session_data = self._http_login()
+            if success:
+                self.session_manager.save_session(
+                    session_data['cookies'],
+                    session_data['headers']
+                )
+                logging.info("Login via HTTP realizado com sucesso!")
+                return True, session_data
+            logging.info("Login via HTTP indisponível - usando navegador")
+        
         logging.info("Iniciando processo de login automatizado")
         
         # Tentar login
@@ -211,58 +527,123 @@ class LoginAutomator:
         logging.error("Todas as tentativas de login falharam")
         return False, {}
     
-    def _attempt_login(self, attempt_num: int, use_headless: bool) -> Tuple[bool, Dict]:
-        """Executa uma tentativa de login"""
-        driver = None
+    def _http_login(self) -> Tuple[bool, Dict]:
+        """Login via requests: GET da página (cookies/CSRF) + POST das credenciais
+        
+        Qualquer falha (status, CAPTCHA, sessão não aceita) devolve (False, {})
+        para que perform_login recorra ao Selenium.
+        """
+        session = requests.Session()
+        session.headers['User-Agent'] = _USER_AGENT
         
         try:
-            # Modificar opções para tentativa específica
-            if use_headless or attempt_num > 1:
-                # Usar headless após primeira tentativa
-                chrome_options = Options()
-                chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                
-                if self.driver:
-                    self.driver.quit()
-                self.driver = webdriver.Chrome(options=chrome_options)
-            else:
-                driver = self.create_driver()
+            page = session.get(self.config.login_url, timeout=15)
+            page.raise_for_status()
             
-            # Navegar para página de login
-            logging.info(f"Tentativa {attempt_num}: Navegando para {self.config.login_url}")
-            driver.get(self.config.login_url)
+            payload = {'email': self.credentials.email, 'password': self.credentials.password}
+            headers = {
+                'Referer': self.config.login_url,
+                'Origin': '{0.scheme}://{0.netloc}'.format(urlparse(self.config.login_url))
+            }
             
-            # Aguardar carregamento
-            time.sleep(3)
+            csrf = _CSRF_RE.search(page.text)
+            if csrf:
+                payload['csrfToken'] = csrf.group(1)
+                headers['X-CSRF-Token'] = csrf.group(1)
             
-            # Encontrar e preencher campos
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.config.email_selector))
-            )
+            cookies_before = set(session.cookies.keys())
+            response = session.post(self.config.http_login_url, json=payload,
+                                    headers=headers, timeout=15)
             
-            password_field = driver.find_element(By.CSS_SELECTOR, self.config.password_selector)
+            if response.status_code != 200:
+                logging.info(f"Login via HTTP recusado: status {response.status_code}")
+                return False, {}
             
-            # Simular digitação humana
-            self._human_like_typing(email_field, self.credentials.email)
-            time.sleep(1)
-            self._human_like_typing(password_field, self.credentials.password)
-            time.sleep(1)
+            if _CAPTCHA_RE.search(response.text):
+                logging.info("Login via HTTP exige CAPTCHA")
+                return False, {}
             
-            # Clicar no botão de login
-            login_button = driver.find_element(By.CSS_SELECTOR, self.config.login_button_selector)
+            # Confirmar: página protegida responde sem redirecionar para o login
+            check = session.get(self.config.http_login_check_url,
+                                allow_redirects=False, timeout=15)
+            location = check.headers.get('Location', '')
+            if check.status_code != 200 or _LOGIN_PAGE_RE.search(location):
+                logging.info("Login via HTTP não gerou sessão autenticada")
+                return False, {}
             
-            # Scroll para o botão se necessário
-            driver.execute_script("arguments[0].scrollIntoView();", login_button)
-            time.sleep(1)
+            # Exigir sinal positivo: cookie novo definido pelo POST ou marcador
+            # de usuário logado na página (200 sozinho pode ser página de erro
+            # ou dashboard protegido só no cliente)
+            auth_cookies = set(session.cookies.keys()) - cookies_before
+            if not auth_cookies and not _LOGGED_IN_RE.search(check.text):
+                logging.info("Login via HTTP sem sinal de autenticação")
+                return False, {}
             
-            login_button.click()
+            return True, {
+                'cookies': session.cookies.get_dict(),
+                'headers': {'User-Agent': _USER_AGENT, 'Referer': self.config.http_login_check_url}
+            }
             
-            # Aguardar redirecionamento
-            success = self._wait_for_login_success(driver)
+        except requests.RequestException as e:
+            logging.info(f"Erro no login via HTTP: {e}")
+            return False, {}
+        finally:
+            session.close()
+    
+    def _attempt_login(self, attempt_num: int, use_headless: bool) -> Tuple[bool, Dict]:
+        """Executa uma tentativa de login"""
+        try:
+            driver = self.create_driver(headless=use_headless)
+            
+            # Nova tentativa: sessão limpa no mesmo navegador (sem reiniciar o Chrome)
+            if attempt_num > 1:
+                driver.delete_all_cookies()
+            
+            # Navegar para página de login
+            logging.info(f"Tentativa {attempt_num}: Navegando para {self.config.login_url}")
+            driver.get(self.config.login_url)
+            
+            # Perfil persistente ainda autenticado: o site já saiu da página de login
+            if self._already_logged_in(driver):
+                logging.info("Sessão do perfil do Chrome ainda ativa - formulário dispensado")
+                success = True
+            else:
+                # Esperas explícitas: cada etapa segue assim que o elemento está utilizável
+                wait = WebDriverWait(driver, 10)
+                
+                # Encontrar e preencher campos
+                email_field = wait.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.config.email_selector))
+                )
+                password_field = wait.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.config.password_selector))
+                )
+                
+                # Digitação humana só com navegador visível; headless preenche via JS
+                if self.config.human_like_typing and not use_headless:
+                    self._human_like_typing(email_field, self.credentials.email)
+                    self._human_like_typing(password_field, self.credentials.password)
+                else:
+                    self._fast_fill(driver, email_field, self.credentials.email)
+                    self._fast_fill(driver, password_field, self.credentials.password)
+                
+                # Clicar no botão de login
+                login_button = wait.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, self.config.login_button_selector))
+                )
+                
+                # Scroll para o botão se necessário (a propriedade já rola a página)
+                _ = login_button.location_once_scrolled_into_view
+                
+                login_button.click()
+                
+                # Aguardar redirecionamento
+                success = self._wait_for_login_success(driver)
             
             if success:
+                if self.config.keep_browser_alive:
+                    self._save_browser_session(driver)
+                
                 # Coletar cookies e headers
                 cookies = {cookie['name']: cookie['value'] for cookie in driver.get_cookies()}
                 
@@ -289,14 +670,27 @@ class LoginAutomator:
         except NoSuchElementException as e:
             logging.error(f"Elemento não encontrado na tentativa {attempt_num}: {e}")
             return False, {}
+        except WebDriverException as e:
+            # Navegador em estado inválido: descartar para a próxima tentativa
+            logging.error(f"Erro do WebDriver na tentativa {attempt_num}: {e}")
+            self._quit_driver()
+            self._forget_browser_session()
+            return False, {}
         except Exception as e:
             logging.error(f"Erro inesperado na tentativa {attempt_num}: {e}")
             return False, {}
+    
+    def _already_logged_in(self, driver) -> bool:
+        """Verificação imediata (sem espera) de login já ativo após driver.get
         
-        finally:
-            if driver and attempt_num == self.config.max_login_attempts:
-                driver.quit()
-                self.driver = None
+        Só vale se a URL já saiu da página de login: palavras-chave no HTML
+        da própria página de login não bastam.
+        """
+        try:
+            reason = driver.execute_script(self._login_check_js)
+        except WebDriverException:
+            return False
+        return bool(reason) and not _LOGIN_PAGE_RE.search(driver.current_url)
     
     def _human_like_typing(self, element, text: str):
         """Simula digitação humana"""
@@ -305,40 +699,37 @@ class LoginAutomator:
             element.send_keys(char)
             time.sleep(0.05 + (0.1 * __import__('random').random()))  # Delay variável
     
+    def _fast_fill(self, driver, element, text: str):
+        """Preenche o campo com uma única chamada execute_script"""
+        driver.execute_script(_FAST_FILL_JS, element, text)
+    
     def _wait_for_login_success(self, driver, timeout: int = 15) -> bool:
         """Aguarda indicadores de login bem-sucedido"""
-        start_time = time.time()
+        check_js = self._login_check_js
+        deadline = time.time() + timeout
         
-        while time.time() - start_time < timeout:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            
             try:
-                current_url = driver.current_url
-                page_source = driver.page_source.lower()
-                
-                # Verificar indicadores na URL
-                for indicator in self.config.success_indicators:
-                    if indicator.lower() in current_url.lower():
-                        logging.info(f"Login detectado via URL: {indicator}")
-                        return True
-                
-                # Verificar indicadores no conteúdo
-                success_keywords = ['dashboard', 'premium content', 'logout', 'profile']
-                for keyword in success_keywords:
-                    if keyword in page_source:
-                        logging.info(f"Login detectado via conteúdo: {keyword}")
-                        return True
-                
-                # Verificar se não está mais na página de login
-                if 'signin' not in current_url and 'login' not in current_url:
-                    time.sleep(2)  # Aguardar estabilizar
-                    if 'signin' not in driver.current_url and 'login' not in driver.current_url:
-                        logging.info("Login detectado - redirecionamento da página de login")
-                        return True
-                
-                time.sleep(1)
-                
-            except Exception as e:
-                logging.error(f"Erro verificando login: {e}")
-                time.sleep(1)
+                reason = WebDriverWait(
+                    driver, remaining, poll_frequency=0.5,
+                    ignored_exceptions=(WebDriverException,)
+                ).until(lambda d: d.execute_script(check_js))
+            except TimeoutException:
+                break
+            
+            if reason != 'redirect':
+                logging.info(f"Login detectado via {reason}")
+                return True
+            
+            # Saiu da página de login: aguardar estabilizar
+            time.sleep(2)
+            if not _LOGIN_PAGE_RE.search(driver.current_url):
+                logging.info("Login detectado - redirecionamento da página de login")
+                return True
         
         logging.warning("Timeout aguardando confirmação de login")
         return False
@@ -391,11 +782,123 @@ class LoginAutomator:
     
     def cleanup(self):
         """Limpa recursos"""
+        self.session_manager.flush()
+        
+        if self.driver and self.config.keep_browser_alive:
+            # Desvincula o chromedriver para que não seja encerrado junto com
+            # o processo; a próxima execução reconecta via attach_session()
+            service = getattr(self.driver, 'service', None)
+            if service is not None:
+                service.process = None
+            self.driver = None
+            return
+        
+        self._quit_driver()
+        
+        # Perfil temporário desta instância não é reaproveitado
+        if self._instance_profile_dir:
+            shutil.rmtree(self._instance_profile_dir, ignore_errors=True)
+            self._instance_profile_dir = None
+    
+    def _quit_driver(self):
+        """Encerra o navegador (se houver)"""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                logging.warning(f"Erro encerrando navegador: {e}")
             self.driver = None
 
 
+class SessionPool:
+    """Pool de requests.Session autenticadas compartilhado pelo processo
+    
+    Uma sessão emprestada nunca é entregue a outro chamador antes de ser
+    devolvida; sessões ociosas há mais de idle_timeout são descartadas.
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, login_system: LoginAutomator, max_size: int = 8,
+                 idle_timeout: float = 300.0,
+                 validate_url: str = "https://www.godofprompt.ai/dashboard"):
+        self.login_system = login_system
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.validate_url = validate_url
+        
+        self._idle = deque()  # (sessão, ociosa desde)
+        self._in_use = set()
+        self._cond = threading.Condition()
+    
+    @classmethod
+    def shared(cls, login_system: LoginAutomator, **kwargs) -> 'SessionPool':
+        """Retorna o pool único do processo (criado na primeira chamada)"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(login_system, **kwargs)
+            return cls._shared
+    
+    def acquire(self, timeout: Optional[float] = None) -> Optional[requests.Session]:
+        """Empresta uma sessão; None se não houver login válido ou no timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._cond:
+            while True:
+                self._evict_idle()
+                
+                if self._idle:
+                    # LIFO: a sessão usada mais recentemente tem conexões vivas
+                    session, _ = self._idle.pop()
+                    self._in_use.add(session)
+                    return session
+                
+                if len(self._in_use) < self.max_size:
+                    session = self.login_system.get_authenticated_session()
+                    if session is not None:
+                        self._in_use.add(session)
+                    return session
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+    
+    def release(self, session: requests.Session, discard: bool = False):
+        """Devolve a sessão ao pool (HEAD rápido confirma que ainda está logada)"""
+        if not discard:
+            try:
+                response = session.head(self.validate_url, allow_redirects=False, timeout=5)
+                location = response.headers.get('Location', '')
+                discard = (response.status_code >= 400 or 
+                           'signin' in location or 'login' in location)
+            except requests.RequestException:
+                discard = True
+        
+        with self._cond:
+            self._in_use.discard(session)
+            if discard:
+                session.close()
+            else:
+                self._idle.append((session, time.monotonic()))
+            self._cond.notify()
+    
+    def _evict_idle(self):
+        """Fecha sessões ociosas há mais de idle_timeout (as mais antigas ficam à esquerda)"""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            session, _ = self._idle.popleft()
+            session.close()
+    
+    def close(self):
+        """Fecha todas as sessões ociosas"""
+        with self._cond:
+            while self._idle:
+                session, _ = self._idle.popleft()
+                session.close()
+
+
 def create_login_system(email: str, password: str) -> LoginAutomator:
     """Factory para criar sistema de login"""
     
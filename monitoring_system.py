@@ -3,6 +3,7 @@
 Sistema de monitoramento e adaptação em tempo real para o GodOfPrompt scraper
 """
 
+import sys
 import time
 import json
 import logging
@@ -422,7 +423,22 @@ class AdaptiveController:
 
 
 # Exemplo de integração
-def create_monitoring_system():
+# dataclass(slots=True) só existe a partir do Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class MonitoringSystem:
+    """Sistema de monitoramento montado por create_monitoring_system"""
+    
+    monitor: SystemMonitor
+    controller: AdaptiveController
+    start: Callable[[], None]
+    stop: Callable[[], None]
+    dashboard: Callable[[], Dict[str, Any]]
+
+
+def create_monitoring_system() -> MonitoringSystem:
     """Cria sistema completo de monitoramento"""
     
     # Configuração de alertas
@@ -445,13 +461,13 @@ def create_monitoring_system():
     
     monitor.add_alert_callback(log_alert)
     
-    return {
-        'monitor': monitor,
-        'controller': controller,
-        'start': lambda: monitor.start_monitoring(),
-        'stop': lambda: monitor.stop_monitoring(),
-        'dashboard': lambda: monitor.get_dashboard_data()
-    }
+    return MonitoringSystem(
+        monitor=monitor,
+        controller=controller,
+        start=monitor.start_monitoring,
+        stop=monitor.stop_monitoring,
+        dashboard=monitor.get_dashboard_data
+    )
 
 
 if __name__ == "__main__":
@@ -459,7 +475,7 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     
     system = create_monitoring_system()
-    system['start']()
+    system.start()
     
     try:
         # Simular algumas requisições
@@ -467,13 +483,13 @@ if __name__ == "__main__":
             success = i % 4 != 0  # 75% de sucesso
             response_time = 5.0 if success else 30.0
             
-            system['monitor'].record_request(success, response_time, 
+            system.monitor.record_request(success, response_time, 
                                            "Error 429" if not success else None)
             time.sleep(1)
         
         # Ver dashboard
-        dashboard = system['dashboard']()
+        dashboard = system.dashboard()
         print(json.dumps(dashboard, indent=2, ensure_ascii=False))
         
     finally:
-        system['stop']()
\ No newline at end of file
+        system.stop()
\ No newline at end of file
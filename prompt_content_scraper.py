@@ -10,7 +10,7 @@ import logging
 import asyncio
 import aiohttp
 import concurrent.futures
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from urllib.parse import urljoin, urlparse
 import re
@@ -26,6 +26,22 @@ from login_automation import LoginAutomator, LoginCredentials, SessionConfig
 from anti_blocking_strategy import AntiDetectionDriver, ScrapingConfig
 from monitoring_system import SystemMonitor
 
+# Padrões compilados uma única vez (usados a cada prompt extraído)
+_DIFFICULTY_PATTERNS = (
+    ('beginner', re.compile(r'\b(beginner|iniciante|básico|easy|fácil)\b')),
+    ('intermediate', re.compile(r'\b(intermediate|intermediário|médio|medium)\b')),
+    ('advanced', re.compile(r'\b(advanced|avançado|expert|difícil|hard)\b'))
+)
+_USE_CASE_PATTERNS = tuple(
+    re.compile(rf'{keyword}[^.]*\.([^.]*\.)', re.IGNORECASE)
+    for keyword in ('use case', 'caso de uso', 'aplicação', 'exemplo')
+)
+_URL_ID_PATTERNS = (
+    re.compile(r'/prompt/([^/?]+)'),
+    re.compile(r'prompt=([^&]+)'),
+    re.compile(r'/([^/?]+)/?$')
+)
+
 
 @dataclass
 class PromptData:
@@ -273,6 +289,17 @@ class PromptContentExtractor:
             if driver:
                 driver.quit()
     
+    def parse_html(self, prompt_data: PromptData, html_content: str, 
+                   extraction_method: str = "aiohttp") -> bool:
+        """Parseia HTML baixado externamente (ex.: por um cliente assíncrono)"""
+        prompt_data.raw_html = html_content
+        prompt_data.extraction_method = extraction_method
+        
+        prompt_data.success = self._parse_html_content(prompt_data, html_content)
+        if not prompt_data.success:
+            prompt_data.error_message = "Nenhum conteúdo principal extraído"
+        return prompt_data.success
+    
     def _parse_html_content(self, prompt_data: PromptData, html_content: str) -> bool:
         """Parseia conteúdo HTML e extrai informações"""
         try:
@@ -352,22 +379,14 @@ class PromptContentExtractor:
             # Procurar por indicadores de dificuldade
             full_text = soup.get_text().lower()
             
-            difficulty_patterns = {
-                'beginner': r'\b(beginner|iniciante|básico|easy|fácil)\b',
-                'intermediate': r'\b(intermediate|intermediário|médio|medium)\b',
-                'advanced': r'\b(advanced|avançado|expert|difícil|hard)\b'
-            }
-            
-            for level, pattern in difficulty_patterns.items():
-                if re.search(pattern, full_text):
+            for level, pattern in _DIFFICULTY_PATTERNS:
+                if pattern.search(full_text):
                     prompt_data.difficulty = level
                     break
             
             # Extrair casos de uso de seções específicas
-            use_case_keywords = ['use case', 'caso de uso', 'aplicação', 'exemplo']
-            for keyword in use_case_keywords:
-                pattern = rf'{keyword}[^.]*\.([^.]*\.)'
-                matches = re.findall(pattern, full_text, re.IGNORECASE)
+            for pattern in _USE_CASE_PATTERNS:
+                matches = pattern.findall(full_text)
                 if matches:
                     prompt_data.use_cases.extend([match.strip() for match in matches[:3]])
             
@@ -399,14 +418,8 @@ class PromptContentExtractor:
         """Extrai ID do prompt da URL"""
         try:
             # Padrões comuns de URL
-            patterns = [
-                r'/prompt/([^/?]+)',
-                r'prompt=([^&]+)',
-                r'/([^/?]+)/?$'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, url)
+            for pattern in _URL_ID_PATTERNS:
+                match = pattern.search(url)
                 if match:
                     return match.group(1)
             
@@ -419,10 +432,18 @@ class PromptContentExtractor:
     def extract_multiple_prompts(self, prompt_urls: List[Dict], 
                                 max_workers: int = 5) -> List[PromptData]:
         """Extrai múltiplos prompts em paralelo"""
+        return list(self.extract_multiple_prompts_iter(prompt_urls, max_workers))
+    
+    def extract_multiple_prompts_iter(self, prompt_urls: List[Dict], 
+                                      max_workers: int = 5) -> Iterator[PromptData]:
+        """Extrai múltiplos prompts em paralelo, entregando cada um ao ficar pronto
+        
+        Nada é acumulado: quem consome decide o que manter de cada PromptData.
+        """
         
         logging.info(f"Iniciando extração de {len(prompt_urls)} prompts")
         
-        results = []
+        successful = failed = 0
         
         # Processar em lotes para controlar recursos
         batch_size = max_workers * 2
@@ -445,12 +466,11 @@ class PromptContentExtractor:
                 for future in concurrent.futures.as_completed(future_to_url, timeout=300):
                     try:
                         result = future.result()
-                        results.append(result)
                     except Exception as e:
                         prompt = future_to_url[future]
                         logging.error(f"Erro processando {prompt['url']}: {e}")
                         # Criar registro de erro
-                        error_data = PromptData(
+                        result = PromptData(
                             id=prompt.get('id', 'unknown'),
                             title="",
                             url=prompt['url'],
@@ -458,20 +478,21 @@ class PromptContentExtractor:
                             error_message=str(e),
                             extracted_at=time.strftime("%Y-%m-%d %H:%M:%S")
                         )
-                        results.append(error_data)
+                    
+                    if result.success:
+                        successful += 1
+                    else:
+                        failed += 1
+                    yield result
             
             # Pausa entre lotes
             if i + batch_size < len(prompt_urls):
                 time.sleep(5)
         
-        logging.info(f"Extração completa: {len(results)} prompts processados")
+        logging.info(f"Extração completa: {successful + failed} prompts processados")
         
         # Estatísticas
-        successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
         logging.info(f"Sucessos: {successful}, Falhas: {failed}")
-        
-        return results
 
 
 def save_prompt_data(prompts: List[PromptData], output_file: str = None):
@@ -50,6 +50,8 @@ setup(
         "performance": [
             "psutil>=5.9.0",
             "memory-profiler>=0.61.0",
+            "pyahocorasick>=2.0.0",
+            "orjson>=3.9.0",
         ],
     },
     entry_points={
@@ -10,12 +10,17 @@ import yaml
 import time
 import logging
 import re
+import zipfile
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import hashlib
 from datetime import datetime
 
+# Padrões usados a cada nome de arquivo gerado
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_\.]')
+_REPEATED_UNDERSCORES = re.compile(r'_+')
+
 
 @dataclass
 class StorageConfig:
@@ -31,7 +36,7 @@ class StorageConfig:
     organize_by_category: bool = True
     
     # Formatos de arquivo
-    prompt_format: str = "markdown"  # markdown, json, txt
+    prompt_format: str = "markdown"  # markdown, json, txt, zip-per-category
     links_format: str = "yaml"       # yaml, json
     
     # Nomenclatura
@@ -83,10 +88,10 @@ class FileManager:
             return filename
         
         # Remover caracteres problemáticos
-        filename = re.sub(r'[^\w\-_\.]', '_', filename)
+        filename = _UNSAFE_FILENAME_CHARS.sub('_', filename)
         
         # Remover underscores múltiplos
-        filename = re.sub(r'_+', '_', filename)
+        filename = _REPEATED_UNDERSCORES.sub('_', filename)
         
         # Limitar comprimento
         if len(filename) > self.config.max_filename_length:
@@ -176,6 +181,10 @@ class PromptStorage:
         self.file_manager = file_manager
         self.config = file_manager.config
         
+        # Formato zip-per-category: um arquivo .zip aberto por categoria
+        self._archives: Dict[str, zipfile.ZipFile] = {}
+        self._archive_members: Dict[str, set] = {}
+        
     def save_prompt(self, prompt_data: Dict[str, Any]) -> str:
         """Salva prompt individual em arquivo"""
         
@@ -184,6 +193,13 @@ class PromptStorage:
         title = prompt_data.get('title', prompt_id)
         category = prompt_data.get('category', 'uncategorized').lower()
         
+        # Nome do arquivo baseado no título e ID
+        base_filename = f"{prompt_id}_{title}"
+        
+        # Todos os prompts da categoria em um único arquivo zip
+        if self.config.prompt_format == "zip-per-category":
+            return self._save_to_archive(prompt_data, category, base_filename)
+        
         # Determinar diretório
         if self.config.organize_by_category:
             prompt_dir = os.path.join(
@@ -196,9 +212,6 @@ class PromptStorage:
         
         Path(prompt_dir).mkdir(parents=True, exist_ok=True)
         
-        # Nome do arquivo baseado no título e ID
-        base_filename = f"{prompt_id}_{title}"
-        
         # Salvar baseado no formato configurado
         if self.config.prompt_format == "markdown":
             return self._save_as_markdown(prompt_data, prompt_dir, base_filename)
@@ -215,7 +228,21 @@ class PromptStorage:
         # Criar backup se arquivo existe
         self.file_manager.create_backup(file_path)
         
-        # Conteúdo Markdown
+        markdown_content = self._render_markdown(prompt_data)
+        
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(markdown_content)
+            
+            logging.info(f"Prompt salvo em Markdown: {file_path}")
+            return file_path
+            
+        except Exception as e:
+            logging.error(f"Erro salvando prompt em Markdown: {e}")
+            raise
+    
+    def _render_markdown(self, prompt_data: Dict) -> str:
+        """Gera o conteúdo Markdown de um prompt"""
         content_parts = []
         
         # Cabeçalho
@@ -226,6 +253,8 @@ class PromptStorage:
         content_parts.append("## 📋 Metadados\n")
         content_parts.append(f"- **ID**: {prompt_data.get('id', 'N/A')}")
         content_parts.append(f"- **Categoria**: {prompt_data.get('category', 'N/A')}")
+        if prompt_data.get('categories'):
+            content_parts.append(f"- **Categorias**: {', '.join(prompt_data['categories'])}")
         content_parts.append(f"- **URL**: {prompt_data.get('url', 'N/A')}")
         
         if prompt_data.get('tags'):
@@ -275,20 +304,62 @@ class PromptStorage:
         if prompt_data.get('error_message'):
             content_parts.append(f"- **Erro**: {prompt_data['error_message']}")
         
-        # Escrever arquivo
-        markdown_content = "\n".join(content_parts)
+        return "\n".join(content_parts)
+    
+    def _save_to_archive(self, prompt_data: Dict, category: str, base_name: str) -> str:
+        """Acrescenta o prompt (Markdown) ao arquivo zip da categoria"""
+        archive_path = os.path.join(
+            self.config.base_dir,
+            self.config.prompts_dir,
+            f"{self._normalize_category(category)}.zip"
+        )
+        
+        archive = self._archives.get(archive_path)
+        if archive is None:
+            if archive_path in self._archive_members:
+                # Reaberto após close_archives(): continua acrescentando
+                mode = 'a'
+            elif os.path.exists(archive_path):
+                # Arquivo de execução anterior (ex.: retomada via checkpoint):
+                # acrescenta sem apagar os prompts já gravados
+                self.file_manager.create_backup(archive_path)
+                with zipfile.ZipFile(archive_path) as existing:
+                    self._archive_members[archive_path] = set(existing.namelist())
+                mode = 'a'
+            else:
+                self._archive_members[archive_path] = set()
+                mode = 'w'
+            archive = zipfile.ZipFile(archive_path, mode, zipfile.ZIP_STORED, allowZip64=True)
+            self._archives[archive_path] = archive
+        
+        # Nome único dentro do arquivo zip
+        members = self._archive_members[archive_path]
+        name = self.file_manager.sanitize_filename(base_name)
+        member = f"{name}.md"
+        counter = 1
+        while member in members:
+            member = f"{name}_{counter}.md"
+            counter += 1
+        members.add(member)
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            logging.info(f"Prompt salvo em Markdown: {file_path}")
-            return file_path
+            archive.writestr(member, self._render_markdown(prompt_data))
+            logging.info(f"Prompt salvo em {archive_path}: {member}")
+            return os.path.join(archive_path, member)
             
         except Exception as e:
-            logging.error(f"Erro salvando prompt em Markdown: {e}")
+            logging.error(f"Erro salvando prompt em ZIP: {e}")
             raise
     
+    def close_archives(self):
+        """Fecha os arquivos zip abertos (grava o diretório central)"""
+        for archive_path, archive in self._archives.items():
+            try:
+                archive.close()
+            except Exception as e:
+                logging.error(f"Erro fechando {archive_path}: {e}")
+        self._archives.clear()
+    
     def _save_as_json(self, prompt_data: Dict, directory: str, base_name: str) -> str:
         """Salva prompt em formato JSON"""
         filename = self.file_manager.generate_unique_filename(base_name, directory, ".json")
@@ -322,6 +393,8 @@ class PromptStorage:
         content_parts.append(f"TÍTULO: {prompt_data.get('title', 'Sem Título')}")
         content_parts.append(f"ID: {prompt_data.get('id', 'N/A')}")
         content_parts.append(f"CATEGORIA: {prompt_data.get('category', 'N/A')}")
+        if prompt_data.get('categories'):
+            content_parts.append(f"CATEGORIAS: {', '.join(prompt_data['categories'])}")
         content_parts.append(f"URL: {prompt_data.get('url', 'N/A')}")
         content_parts.append(f"EXTRAÍDO EM: {prompt_data.get('extracted_at', 'N/A')}")
         content_parts.append("")
@@ -390,6 +463,8 @@ class PromptStorage:
                 logging.error(f"Erro salvando prompt {i}: {e}")
                 continue
         
+        self.close_archives()
+        
         logging.info(f"✅ {len(saved_files)} prompts salvos com sucesso")
         return saved_files
 